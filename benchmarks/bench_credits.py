@@ -0,0 +1,87 @@
+"""
+Throughput of the batch credit extraction against the per-movie path.
+
+Measures the extraction on its own, then a threaded fetch against simulated
+I/O: JSON decoding after a sleep, with the credits extracted in each fetch
+thread (the old path) or in one batch once all fetches are done.
+
+    python -m benchmarks.bench_credits --movies 1000 10000 --latency 0.02
+"""
+import argparse
+import json
+import random
+import time
+from settings.utils import run_threaded
+from transform.credits import attach_credits, extract_credit_info
+
+JOBS = ["Producer", "Editor", "Writer", "Director", "Sound", "Casting", "Music", "Art Direction"]
+
+
+def make_payload(movie_id: int, rng: random.Random) -> dict:
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "credits": {
+            "cast": [
+                {"id": i, "name": f"Actor {rng.randrange(50_000)}", "character": "Role", "order": i}
+                for i in range(rng.randrange(5, 60))
+            ],
+            "crew": [
+                {"id": i, "name": f"Crew {rng.randrange(50_000)}", "job": rng.choice(JOBS), "department": "Crew"}
+                for i in range(rng.randrange(5, 150))
+            ],
+        },
+    }
+
+
+def make_bodies(n_movies: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {movie_id: json.dumps(make_payload(movie_id, rng)) for movie_id in range(n_movies)}
+
+
+def per_movie(movies: dict) -> dict:
+    for payload in movies.values():
+        payload.update(extract_credit_info(payload))
+    return movies
+
+
+def threaded_fetch(bodies: dict, latency: float, batch: bool) -> dict:
+    def fetch(movie_id):
+        time.sleep(latency)
+        payload = json.loads(bodies[movie_id])
+        if not batch:
+            payload.update(extract_credit_info(payload))
+        return payload
+
+    movies = run_threaded(fetch, list(bodies), max_workers=10)
+    return attach_credits(movies) if batch else movies
+
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated seconds per request")
+    args = parser.parse_args()
+
+    print(f"{'movies':>8}{'':>3}{'per movie':>14}{'batch':>14}")
+    for n_movies in args.movies:
+        bodies = make_bodies(n_movies)
+        decode = lambda: {movie_id: json.loads(body) for movie_id, body in bodies.items()}
+
+        single = timed(per_movie, decode())
+        batch = timed(attach_credits, decode())
+        print(f"{n_movies:>8}{'cpu':>3}{n_movies / single:>11,.0f}/s{n_movies / batch:>11,.0f}/s")
+
+        single = timed(threaded_fetch, bodies, args.latency, False)
+        batch = timed(threaded_fetch, bodies, args.latency, True)
+        print(f"{n_movies:>8}{'io':>3}{n_movies / single:>11,.0f}/s{n_movies / batch:>11,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
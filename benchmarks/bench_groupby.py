@@ -0,0 +1,59 @@
+"""
+Scaling benchmark for the partitioned KPI aggregations.
+
+    python -m benchmarks.bench_groupby --rows 2000000 --workers 1 2 4 8
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from scripts.kpi import franchise_vs_standalone, most_successful_directors, most_successful_franchises
+
+
+def make_catalog(n_rows: int, n_directors: int, n_collections: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    collections = pd.Series(rng.integers(0, n_collections, n_rows)).map("Collection {}".format)
+    return pd.DataFrame({
+        "id": np.arange(n_rows),
+        "revenue_musd": rng.gamma(2, 50, n_rows).round(2),
+        "budget_musd": rng.gamma(2, 20, n_rows).round(2),
+        "popularity": rng.random(n_rows) * 100,
+        "vote_average": rng.integers(0, 100, n_rows) / 10,
+        "belongs_to_collection": collections.where(rng.random(n_rows) < 0.4),
+        "director": pd.Series(rng.integers(0, n_directors, n_rows)).map("Director {}".format),
+    })
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--directors", type=int, default=200_000)
+    parser.add_argument("--collections", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_catalog(args.rows, args.directors, args.collections)
+    kpis = [franchise_vs_standalone, most_successful_franchises, most_successful_directors]
+
+    print(f"{'kpi':<28}" + "".join(f"{f'{w} worker(s)':>14}" for w in args.workers))
+    for kpi in kpis:
+        serial = kpi(df)
+        row = f"{kpi.__name__:<28}"
+        for workers in args.workers:
+            pd.testing.assert_frame_equal(kpi(df, n_workers=workers), serial, check_exact=True)
+            row += f"{best_of(lambda: kpi(df, n_workers=workers), args.repeat):>13.3f}s"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
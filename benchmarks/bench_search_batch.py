@@ -0,0 +1,76 @@
+"""
+Throughput of search_batch against running the same queries one by one.
+
+    python -m benchmarks.bench_search_batch --rows 500000 --queries 10 100 1000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from scripts.search import apply_filter, search_batch
+
+GENRES = ["Action", "Drama", "Comedy", "Science Fiction", "Thriller", "Horror", "Romance", "Crime"]
+
+
+def make_catalog(n_rows: int, n_people: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    people = np.array([f"Person {i}" for i in range(n_people)])
+    genres = np.array(["|".join(rng.choice(GENRES, 2, replace=False)) for _ in range(64)])
+    return pd.DataFrame({
+        "title": [f"Movie {i}" for i in range(n_rows)],
+        "genres": genres[rng.integers(0, len(genres), n_rows)],
+        "cast": ["|".join(c) for c in people[rng.integers(0, n_people, (n_rows, 3))]],
+        "vote_average": rng.integers(0, 100, n_rows) / 10,
+    })
+
+
+def make_queries(n_queries: int, n_people: int, seed: int = 1) -> list:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "cast": f"Person {rng.integers(0, n_people)}",
+            "genres": str(rng.choice(GENRES)),
+            "vote_average": (float(rng.integers(0, 8)), None),
+        }
+        for _ in range(n_queries)
+    ]
+
+
+def run_one_by_one(df: pd.DataFrame, queries: list) -> list:
+    results = []
+    for query in queries:
+        condition = lambda d, q=query: (
+            d["cast"].str.contains(q["cast"], case=False, na=False, regex=False)
+            & d["genres"].str.contains(q["genres"], case=False, na=False, regex=False)
+            & (d["vote_average"] >= q["vote_average"][0])
+        )
+        results.append(apply_filter(df, condition))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--people", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    df = make_catalog(args.rows, args.people)
+    print(f"{'queries':>8}{'one by one':>14}{'batch':>10}{'speedup':>10}")
+    for n_queries in args.queries:
+        queries = make_queries(n_queries, args.people)
+
+        started = time.perf_counter()
+        expected = run_one_by_one(df, queries)
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = search_batch(df, queries)
+        batch = time.perf_counter() - started
+
+        assert all(a.index.equals(b.index) for a, b in zip(expected, results))
+        print(f"{n_queries:>8}{single:>13.2f}s{batch:>9.2f}s{single / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,255 @@
-import requests
 import os
-from dotenv import load_dotenv
 import logging
-from typing import List, Optional, Dict
-from settings.config import settings
-from settings.utils import get_retry_session, run_threaded
+import threading
+from typing import Iterator, List, Optional, Dict, NamedTuple, Union
+from settings.utils import (
+    CircuitBreaker, RetryBudget, RetryBudgetExhausted, SingleFlight, get_retry_session, run_threaded,
+)
+from transform.credits import attach_credits, extract_credit_info
 
 
-API_KEY = settings.TMDB_API_KEY
-BASE_URL = settings.TMDB_API_URL
+# The settings and the retry session are built on first use (see `get_session`
+# and the module `__getattr__` below), so importing this module stays cheap.
+_session = None
+_session_lock = threading.Lock()
 
-session = get_retry_session()
+# Shares one in-flight request between concurrent callers asking for the same movie
+_single_flight = SingleFlight()
+_dedup_stats = {"deduplicated": 0}
+
+# Retries are capped at 10% of the requests across all fetch threads, and the
+# breaker stops calling TMDB for a while once half of the recent calls failed
+_retry_budget = RetryBudget(ratio=0.1, reserve=10)
+_breaker = CircuitBreaker(failure_rate=0.5, window=50, min_calls=20, cooldown=30.0)
+
+REQUEST_TIMEOUT = 10
 
-# Logging configuration showing metadata like time. Currently logging in the command line.
-_log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=_log_level,
-    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-)
 logger = logging.getLogger(__name__)
 
 
-def extract_credit_info(movie: dict) -> dict:
-    """Extract cast list, cast size, director, and crew size from TMDB credits.
+def configure_logging() -> None:
+    """Logging configuration showing metadata like time. Currently logging in the command line."""
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+    )
+
+
+def get_settings():
+    """Returns the TMDB settings, pydantic is only imported on first use."""
+    from settings import config
+    return config.get_settings()
+
+
+def get_session():
+    """Returns the shared retry session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = get_retry_session(budget=_retry_budget)
+    return _session
+
+
+def __getattr__(name: str):
+    # `API_KEY`, `BASE_URL` and `session` used to be built at import time
+    if name == "API_KEY":
+        return get_settings().TMDB_API_KEY
+    if name == "BASE_URL":
+        return get_settings().TMDB_API_URL
+    if name == "session":
+        return get_session()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FetchFailure(NamedTuple):
+    """
+    Why a fetch failed. `kind` is one of:
+    network, timeout, rate_limited, http_5xx, retry_budget_exhausted, circuit_open
+    (transient, worth retrying later), not_found, http_4xx, http_other and decode.
+    retry_budget_exhausted covers both a connection error and a 429/5xx response
+    whose retry the budget refused; `status` is set for the latter.
     """
-    credits = movie.get("credits", {})
+    kind: str
+    detail: str
+    status: Optional[int] = None
 
-    cast_list = [member.get("name") for member in credits.get("cast", []) if "name" in member]
-    cast_size = len(cast_list)
+    @property
+    def transient(self) -> bool:
+        return self.kind in TRANSIENT_FAILURES
 
-    crew_list = credits.get("crew", [])
-    crew_size = len(crew_list)
+    @classmethod
+    def from_json(cls, value: Union[dict, str]) -> "FetchFailure":
+        # Journals written before failures were classified hold a bare string
+        if isinstance(value, str):
+            return cls("unknown", value)
+        return cls(**value)
 
-    director = None
-    for member in crew_list:
-        if member.get("job") == "Director":
-            director = member.get("name")
-            break
 
-    return {
-        "cast": cast_list,
-        "cast_size": cast_size,
-        "director": director,
-        "crew_size": crew_size,
-    }
-  
-def fetch_single_movie(movie_id: int) -> Optional[dict]:
-    url = f"{BASE_URL}/movie/{movie_id}"
+TRANSIENT_FAILURES = frozenset({
+    "network", "timeout", "rate_limited", "http_5xx", "retry_budget_exhausted", "circuit_open",
+})
+
+
+class FetchResult(NamedTuple):
+    """Outcome of a single movie fetch: the payload, or the reason it failed."""
+    data: Optional[dict]
+    error: Optional[FetchFailure] = None
+
+
+def _status_failure(status: int) -> FetchFailure:
+    if status == 404:
+        kind = "not_found"
+    elif status == 429:
+        kind = "rate_limited"
+    elif 400 <= status < 500:
+        kind = "http_4xx"
+    elif status >= 500:
+        kind = "http_5xx"
+    else:
+        kind = "http_other"
+    return FetchFailure(kind, f"http {status}", status)
+
+
+def _exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    """The exception and everything it wraps; requests buries urllib3 errors in args and `reason`."""
+    seen, stack = set(), [exc]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, BaseException) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        stack.extend([current.__cause__, current.__context__, getattr(current, "reason", None), *current.args])
+
+
+def _exception_failure(exc: Exception) -> FetchFailure:
+    import requests
+    from urllib3.exceptions import TimeoutError as Urllib3TimeoutError
+
+    detail = f"{type(exc).__name__}: {exc}"
+    chain = list(_exception_chain(exc))
+    if any(isinstance(e, RetryBudgetExhausted) for e in chain):
+        return FetchFailure("retry_budget_exhausted", detail)
+    if any(isinstance(e, (requests.Timeout, Urllib3TimeoutError, TimeoutError)) for e in chain):
+        return FetchFailure("timeout", detail)
+    return FetchFailure("network", detail)
+
+
+def _request_movie(movie_id: int) -> FetchResult:
+    if not _breaker.allow():
+        return FetchResult(None, FetchFailure("circuit_open", "TMDB error rate too high, not calling it"))
+
+    result = _call_tmdb(movie_id)
+    _breaker.record(result.error is None or not result.error.transient)
+    return result
+
+
+def _call_tmdb(movie_id: int) -> FetchResult:
+    settings = get_settings()
+    url = f"{settings.TMDB_API_URL}/movie/{movie_id}"
     params = {
-        "api_key": API_KEY,
+        "api_key": settings.TMDB_API_KEY,
         "append_to_response": "credits",
     }
 
     try:
-        resp = session.get(url, params=params, timeout=10)
-    except Exception:
-        return None
+        resp = get_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+    except Exception as exc:
+        return FetchResult(None, _exception_failure(exc))
 
     if resp.status_code != 200:
-        return None
+        if getattr(resp.raw, "retry_budget_exhausted", False) is True:
+            return FetchResult(None, FetchFailure(
+                "retry_budget_exhausted", f"http {resp.status_code}, retry budget exhausted", resp.status_code))
+        return FetchResult(None, _status_failure(resp.status_code))
 
     try:
         data = resp.json()
+        if not isinstance(data, dict):
+            raise TypeError(f"expected a JSON object, got {type(data).__name__}")
+        return FetchResult(data)
+    except Exception as exc:
+        return FetchResult(None, FetchFailure("decode", f"{type(exc).__name__}: {exc}"))
+
+
+def fetch_movie_result(movie_id: int, with_credits: bool = True) -> FetchResult:
+    """Fetch one movie and keep the failure reason instead of discarding it.
+
+    Concurrent calls for the same ID are coalesced into a single request,
+    whether they want the credit fields or not. With `with_credits=False` the
+    payload is returned as TMDB sent it, shared by every coalesced caller;
+    otherwise the credit fields are added to the caller's own copy of it.
+    """
+    result = _single_flight.do(movie_id, lambda: _request_movie(movie_id))
+    if not with_credits or result.data is None:
+        return result
+
+    data = dict(result.data)
+    try:
         data.update(extract_credit_info(data))
-        return data
-    except Exception:
-        return None
+    except Exception as exc:
+        return FetchResult(None, FetchFailure("decode", f"{type(exc).__name__}: {exc}"))
+    return FetchResult(data)
+
+
+def fetch_single_movie(movie_id: int, with_credits: bool = True) -> Optional[dict]:
+    """Fetch one movie, None if it failed; `fetch_movie_result` tells why."""
+    return fetch_movie_result(movie_id, with_credits).data
 
 
+def _fetch_raw_movie(movie_id: int) -> Optional[dict]:
+    # A copy, the credit fields are added to it in place once all fetches are done
+    data = fetch_single_movie(movie_id, with_credits=False)
+    return dict(data) if data is not None else None
+
 
 def fetch_movies(movie_ids: List[int]) -> Dict[int, Optional[dict]]:
     """Fetch movie details for a list of Movie IDs.
 
     Returns a dictionary mapping movie_id -> movie data (or None if fetch failed).
+    Duplicate IDs are collapsed before dispatch. The fetch threads only do the
+    requests, the credit fields are extracted for all movies at once afterwards.
     """
-    logger.info("Fetching %d movies...", len(movie_ids))
+    unique_ids = list(dict.fromkeys(movie_ids))
+    duplicates = len(movie_ids) - len(unique_ids)
+    if duplicates:
+        _dedup_stats["deduplicated"] += duplicates
+        logger.info("Dropped %d duplicate movie IDs", duplicates)
+
+    logger.info("Fetching %d movies...", len(unique_ids))
 
     movies = run_threaded(
-        worker_fn=fetch_single_movie,
-        items=movie_ids,
+        worker_fn=_fetch_raw_movie,
+        items=unique_ids,
         max_workers=10,
     )
+    attach_credits(movies)
 
-    logger.info("Completed fetch for %d movies", len(movie_ids))
+    logger.info("Completed fetch for %d movies", len(unique_ids))
     return movies
 
+
+def fetch_stats() -> Dict[str, int]:
+    """Request counters: calls made, requests executed, calls coalesced
+    onto an in-flight request, duplicate input IDs dropped, HTTP requests sent,
+    retries spent and denied by the retry budget, and calls the circuit breaker
+    rejected and the times it opened."""
+    return {
+        **_single_flight.stats,
+        **_dedup_stats,
+        **_retry_budget.stats,
+        "circuit_rejected": _breaker.stats["rejected"],
+        "circuit_opened": _breaker.stats["opened"],
+    }
+
+
+def reset_fetch_stats() -> None:
+    _single_flight.reset_stats()
+    _dedup_stats["deduplicated"] = 0
+    _retry_budget.reset_stats()
+    _breaker.reset_stats()
+
 movie_ids = [
     0, 299534, 19995, 140607, 299536, 597,
     135397, 420818, 24428, 168259, 99861,
@@ -95,6 +260,7 @@ movie_ids = [
 
 # Test the script
 if __name__ == "__main__":
+    configure_logging()
     movies = fetch_movies(movie_ids)
     # dataframe = json_to_dataframe(movies)
     print(movies)
@@ -0,0 +1,119 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional
+
+from extract import api
+
+logger = logging.getLogger(__name__)
+
+# TMDB refuses page numbers above this on its paged list endpoints
+TMDB_MAX_PAGES = 500
+
+
+def fetch_discover_page(endpoint: str, page: int, params: Optional[dict] = None) -> dict:
+    """Fetch a single page of a paged TMDB list endpoint such as
+    `discover/movie` or `movie/popular`."""
+    settings = api.get_settings()
+    url = f"{settings.TMDB_API_URL}/{endpoint}"
+    query = {**(params or {}), "api_key": settings.TMDB_API_KEY, "page": page}
+
+    resp = api.get_session().get(url, params=query, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _page_ids(payload: dict) -> List[int]:
+    return [item["id"] for item in payload.get("results", []) if "id" in item]
+
+
+def discover_movie_ids(
+    endpoint: str = "discover/movie",
+    params: Optional[dict] = None,
+    max_pages: Optional[int] = None,
+    max_workers: int = 4,
+    prefetch: int = 8,
+    page_fetcher: Optional[Callable[[int], dict]] = None,
+) -> Iterator[int]:
+    """
+    Pages through a TMDB list endpoint and yields movie IDs as pages arrive.
+
+    The first page is fetched to learn `total_pages`, after that up to `prefetch`
+    pages are kept in flight at once and their IDs are yielded in completion
+    order. IDs already yielded are skipped, since popularity-ordered lists shift
+    between pages. A page that fails is logged and skipped.
+    `page_fetcher` takes a page number and returns the page payload, it defaults
+    to fetching `endpoint` from TMDB.
+    """
+    if page_fetcher is None:
+        page_fetcher = lambda page: fetch_discover_page(endpoint, page, params)
+
+    seen = set()
+
+    def fresh(ids: List[int]) -> Iterator[int]:
+        for movie_id in ids:
+            if movie_id not in seen:
+                seen.add(movie_id)
+                yield movie_id
+
+    first = page_fetcher(1)
+    total_pages = min(first.get("total_pages", 1), max_pages or TMDB_MAX_PAGES, TMDB_MAX_PAGES)
+    logger.info("Discovering movies from %s: %d pages", endpoint, total_pages)
+
+    yield from fresh(_page_ids(first))
+
+    remaining = iter(range(2, total_pages + 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+
+        def top_up():
+            while len(in_flight) < prefetch:
+                page = next(remaining, None)
+                if page is None:
+                    return
+                in_flight[executor.submit(page_fetcher, page)] = page
+
+        top_up()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = in_flight.pop(future)
+                try:
+                    ids = _page_ids(future.result())
+                except Exception as exc:
+                    logger.warning("Skipping discover page %d: %s", page, exc)
+                    continue
+                yield from fresh(ids)
+            top_up()
+
+
+def fetch_discovered(
+    endpoint: str = "discover/movie",
+    params: Optional[dict] = None,
+    max_pages: Optional[int] = None,
+    discover_workers: int = 4,
+    detail_workers: int = 10,
+    prefetch: int = 8,
+    page_fetcher: Optional[Callable[[int], dict]] = None,
+    fetch_fn: Callable[[int], Optional[dict]] = api.fetch_single_movie,
+) -> Dict[int, Optional[dict]]:
+    """
+    Discovers movie IDs and fetches their details in one streaming pass.
+
+    Each ID is handed to the detail fetchers the moment its page arrives,
+    so detail requests overlap with the discovery requests still in flight.
+    Returns the same movie_id -> movie data (or None) mapping as `fetch_movies`.
+    """
+    ids = discover_movie_ids(
+        endpoint=endpoint,
+        params=params,
+        max_pages=max_pages,
+        max_workers=discover_workers,
+        prefetch=prefetch,
+        page_fetcher=page_fetcher,
+    )
+
+    with ThreadPoolExecutor(max_workers=detail_workers) as executor:
+        futures = {movie_id: executor.submit(fetch_fn, movie_id) for movie_id in ids}
+
+    logger.info("Completed discovery fetch for %d movies", len(futures))
+    return {movie_id: future.result() for movie_id, future in futures.items()}
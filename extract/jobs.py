@@ -0,0 +1,159 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from extract.api import FetchFailure, FetchResult, fetch_movie_result
+from settings.utils import iter_threaded
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionJob():
+    """
+    A resumable bulk extraction job.
+
+    Every finished fetch is appended to a JSON-lines journal as soon as it
+    completes, so a run that dies halfway can be restarted without fetching
+    the already completed IDs again. Failed IDs are journaled with their
+    reason and can be re-fetched on their own with `retry_failed`.
+    """
+
+    def __init__(
+        self,
+        journal_path: Union[str, Path],
+        fetch_fn: Callable[[int], FetchResult] = fetch_movie_result,
+        max_workers: int = 10,
+        progress_every: int = 50,
+    ):
+        self.journal_path = Path(journal_path)
+        self.fetch_fn = fetch_fn
+        self.max_workers = max_workers
+        self.progress_every = progress_every
+
+        self.completed: Dict[int, dict] = {}
+        self.failed: Dict[int, FetchFailure] = {}
+        self.progress: Dict[str, float] = {}
+
+        self._load_journal()
+
+    def _truncate_torn_tail(self) -> None:
+        """
+        Cuts a partial last line left by a crashed run, so the next entry
+        appended starts on a line of its own instead of continuing the fragment.
+        """
+        with self.journal_path.open("rb+") as fh:
+            end = fh.seek(0, 2)
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                fh.seek(start)
+                chunk = fh.read(position - start)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+
+            if position != end:
+                logger.warning("Dropping %d bytes of a torn journal line", end - position)
+                fh.truncate(position)
+
+    def _load_journal(self) -> None:
+        """Replays the journal; the latest entry for an ID wins."""
+        if not self.journal_path.exists():
+            return
+
+        self._truncate_torn_tail()
+        with self.journal_path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crashed run, that ID is simply pending again
+                    continue
+
+                movie_id = entry["id"]
+                if entry["status"] == "ok":
+                    self.completed[movie_id] = entry["data"]
+                    self.failed.pop(movie_id, None)
+                else:
+                    self.failed[movie_id] = FetchFailure.from_json(entry["reason"])
+
+        logger.info(
+            "Loaded journal %s: %d completed, %d failed",
+            self.journal_path, len(self.completed), len(self.failed),
+        )
+
+    def _record(self, fh, movie_id: int, result: FetchResult) -> None:
+        if result.data is not None:
+            entry = {"id": movie_id, "status": "ok", "data": result.data}
+            self.completed[movie_id] = result.data
+            self.failed.pop(movie_id, None)
+        else:
+            entry = {"id": movie_id, "status": "failed", "reason": result.error._asdict()}
+            self.failed[movie_id] = result.error
+
+        fh.write(json.dumps(entry) + "\n")
+        fh.flush()
+
+    def _execute(self, movie_ids: List[int]) -> None:
+        total = len(movie_ids)
+        self.progress = {"done": 0, "total": total, "succeeded": 0, "failed": 0,
+                         "elapsed": 0.0, "movies_per_sec": 0.0}
+        if not total:
+            return
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+
+        with self.journal_path.open("a", encoding="utf-8") as fh:
+            results = iter_threaded(self.fetch_fn, movie_ids, max_workers=self.max_workers)
+            for done, (movie_id, result) in enumerate(results, start=1):
+                self._record(fh, movie_id, result)
+
+                elapsed = time.perf_counter() - started
+                self.progress.update(
+                    done=done,
+                    succeeded=self.progress["succeeded"] + (result.data is not None),
+                    failed=self.progress["failed"] + (result.data is None),
+                    elapsed=elapsed,
+                    movies_per_sec=done / elapsed if elapsed else 0.0,
+                )
+
+                if done % self.progress_every == 0 or done == total:
+                    logger.info(
+                        "Progress %d/%d (%d failed) - %.1f movies/s",
+                        done, total, self.progress["failed"], self.progress["movies_per_sec"],
+                    )
+
+    def _results_for(self, movie_ids: List[int]) -> Dict[int, Optional[dict]]:
+        return {mid: self.completed.get(mid) for mid in movie_ids}
+
+    def run(self, movie_ids: List[int]) -> Dict[int, Optional[dict]]:
+        """
+        Fetches every ID that is not yet in the journal.
+        IDs that already completed or already failed are skipped,
+        use `retry_failed` to give the failed ones another go.
+        Returns the same movie_id -> data (or None) mapping as `fetch_movies`.
+        """
+        unique_ids = list(dict.fromkeys(movie_ids))
+        pending = [mid for mid in unique_ids
+                   if mid not in self.completed and mid not in self.failed]
+
+        logger.info(
+            "Job resuming with %d of %d movies pending",
+            len(pending), len(unique_ids),
+        )
+        self._execute(pending)
+
+        return self._results_for(unique_ids)
+
+    def retry_failed(self) -> Dict[int, Optional[dict]]:
+        """Re-fetches only the IDs the journal records as failed."""
+        failed_ids = list(self.failed)
+        logger.info("Retrying %d failed movies", len(failed_ids))
+        self._execute(failed_ids)
+
+        return self._results_for(failed_ids)
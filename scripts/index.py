@@ -0,0 +1,150 @@
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# (low, high) or (low, high, inclusive), either bound may be None for an open range
+Range = Tuple
+
+INCLUSIVE_SIDES = {
+    "both": (True, True),
+    "neither": (False, False),
+    "left": (True, False),
+    "right": (False, True),
+}
+
+
+def split_range(bounds: Range, inclusive: str) -> Tuple[object, object, str]:
+    """Normalises a range to (low, high, inclusive), using the default side when omitted."""
+    if len(bounds) == 3:
+        return bounds
+    low, high = bounds
+    return low, high, inclusive
+
+
+def range_mask(series: pd.Series, low=None, high=None, inclusive: str = "both") -> pd.Series:
+    """
+    Boolean mask of the rows whose value lies in the range, the full-scan
+    equivalent of a `SortedIndex` lookup. Missing values never match.
+    """
+    left_closed, right_closed = INCLUSIVE_SIDES[inclusive]
+    mask = series.notna()
+    if low is not None:
+        mask &= (series >= low) if left_closed else (series > low)
+    if high is not None:
+        mask &= (series <= high) if right_closed else (series < high)
+    return mask.fillna(False).astype(bool)
+
+
+class SortedIndex():
+    """
+    A sorted (argsort) index over one numeric or datetime column.
+    Range predicates resolve with two binary searches, missing values are left out.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+        if self.is_datetime:
+            # Compare dates as int64 nanoseconds, float64 would round them
+            self.values = series.astype("datetime64[ns]").to_numpy().view("int64")
+            self.valid = self.values != np.iinfo(np.int64).min
+        else:
+            self.values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            # From the converted values, so entries that are not numbers are left out like missing ones
+            self.valid = ~np.isnan(self.values)
+
+        valid_positions = np.flatnonzero(self.valid)
+        order = np.argsort(self.values[valid_positions], kind="stable")
+        self.order = valid_positions[order]
+        self.sorted_values = self.values[self.order]
+
+    def _coerce(self, bound):
+        if bound is None:
+            return None
+        if self.is_datetime:
+            return pd.Timestamp(bound).as_unit("ns").value
+        return float(bound)
+
+    def bounds(self, low=None, high=None, inclusive: str = "both") -> Tuple[int, int]:
+        """Start and stop offsets into `order` for the values in the range."""
+        left_closed, right_closed = INCLUSIVE_SIDES[inclusive]
+        low, high = self._coerce(low), self._coerce(high)
+
+        start = 0 if low is None else int(np.searchsorted(
+            self.sorted_values, low, side="left" if left_closed else "right"))
+        stop = len(self.order) if high is None else int(np.searchsorted(
+            self.sorted_values, high, side="right" if right_closed else "left"))
+        return start, max(start, stop)
+
+    def range(self, low=None, high=None, inclusive: str = "both") -> np.ndarray:
+        """Row positions with a value in the range, in value order."""
+        start, stop = self.bounds(low, high, inclusive)
+        return self.order[start:stop]
+
+    def contains(self, positions: np.ndarray, low=None, high=None, inclusive: str = "both") -> np.ndarray:
+        """Boolean array telling which of the given row positions lie in the range."""
+        left_closed, right_closed = INCLUSIVE_SIDES[inclusive]
+        low, high = self._coerce(low), self._coerce(high)
+
+        values = self.values[positions]
+        keep = self.valid[positions].copy()
+        if low is not None:
+            keep &= (values >= low) if left_closed else (values > low)
+        if high is not None:
+            keep &= (values <= high) if right_closed else (values < high)
+        return keep
+
+
+class MovieIndex():
+    """
+    Sorted indexes over the numeric and date columns of a cleaned movie frame.
+    Built once, then range lookups on those columns avoid full boolean scans.
+    The frame must not be modified or reordered after the index is built.
+    """
+
+    DEFAULT_COLUMNS = ("runtime", "vote_average", "release_date", "budget_musd")
+
+    def __init__(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None):
+        columns = self.DEFAULT_COLUMNS if columns is None else columns
+        self.n_rows = len(df)
+        self.indexes: Dict[str, SortedIndex] = {
+            col: SortedIndex(df[col]) for col in columns if col in df.columns
+        }
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.indexes
+
+    def lookup(self, ranges: Dict[str, Range], inclusive: str = "both") -> np.ndarray:
+        """
+        Row positions (ascending) matching every range predicate.
+
+        The most selective predicate is resolved by binary search and the
+        other predicates are only checked on its candidates, so the cost
+        follows the size of the smallest range rather than the frame.
+        """
+        if not ranges:
+            return np.arange(self.n_rows)
+
+        predicates = []
+        for column, bounds in ranges.items():
+            if column not in self.indexes:
+                raise KeyError(f"Column '{column}' is not indexed.")
+            low, high, side = split_range(bounds, inclusive)
+            index = self.indexes[column]
+            start, stop = index.bounds(low, high, side)
+            predicates.append((stop - start, index, (low, high, side), (start, stop)))
+
+        predicates.sort(key=lambda p: p[0])
+        _, driver, _, (start, stop) = predicates[0]
+        candidates = driver.order[start:stop]
+
+        for _, index, (low, high, side), _ in predicates[1:]:
+            if not len(candidates):
+                break
+            candidates = candidates[index.contains(candidates, low, high, side)]
+
+        return np.sort(candidates)
+
+    def select(self, df: pd.DataFrame, ranges: Dict[str, Range], inclusive: str = "both") -> pd.DataFrame:
+        if len(df) != self.n_rows:
+            raise ValueError("The index was built for a different frame.")
+        return df.iloc[self.lookup(ranges, inclusive)]
@@ -1,5 +1,12 @@
-from typing import Optional
-import pandas as pd
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+# pandas is only needed for the annotations, callers already have it loaded
+if TYPE_CHECKING:
+    import pandas as pd
+
+# A single frame or an iterable of frames streamed in chunks
+FrameOrChunks = Union["pd.DataFrame", Iterable["pd.DataFrame"]]
 
 
 def rank_movies(
@@ -25,25 +32,62 @@ def highest_budget(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     return rank_movies(df, metric="budget_musd", ascending=False, top_n=top_n)
 
 
+def _profit(df: pd.DataFrame) -> pd.Series:
+    # Reuse the column from MovieDataCleaner.add_derived_metrics when it is there
+    if "profit" in df.columns:
+        return df["profit"]
+    return df["revenue_musd"] - df["budget_musd"]
+
+
+def _roi(df: pd.DataFrame) -> pd.Series:
+    if "roi" in df.columns:
+        return df["roi"]
+    return df["revenue_musd"] / df["budget_musd"]
+
+
+def _is_franchise(df: pd.DataFrame) -> pd.Series:
+    if "is_franchise" in df.columns:
+        return df["is_franchise"]
+    return df["belongs_to_collection"].notna()
+
+
+def _rank_by_values(
+    df: pd.DataFrame,
+    values: pd.Series,
+    name: str,
+    ascending: bool,
+    top_n: int,
+    mask: Optional[pd.Series] = None,
+) -> pd.DataFrame:
+    """
+    Ranks the rows of `df` by `values` without copying the whole frame,
+    only the top_n selected rows are materialised and get `name` attached.
+    """
+    # Work on positions so duplicate index labels cannot widen the selection
+    values = values.reset_index(drop=True)
+    if mask is not None:
+        values = values[mask.fillna(False).to_numpy(dtype=bool)]
+
+    positions = values.sort_values(ascending=ascending).head(top_n).index
+    result = df.iloc[positions]
+    if name not in result.columns:
+        result = result.assign(**{name: values.loc[positions].to_numpy()})
+    return result
+
+
 def highest_profit(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-    temp = df.copy()
-    temp["profit"] = temp["revenue_musd"] - temp["budget_musd"]
-    return rank_movies(temp, metric="profit", ascending=False, top_n=top_n)
+    return _rank_by_values(df, _profit(df), "profit", ascending=False, top_n=top_n)
 
 def lowest_profit(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-    temp = df.copy()
-    temp["profit"] = temp["revenue_musd"] - temp["budget_musd"]
-    return rank_movies(temp, metric="profit", ascending=True, top_n=top_n)
+    return _rank_by_values(df, _profit(df), "profit", ascending=True, top_n=top_n)
 
 def highest_roi(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-    temp = df[df["budget_musd"] >= 10].copy()
-    temp["roi"] = temp["revenue_musd"] / temp["budget_musd"]
-    return rank_movies(temp, metric="roi", ascending=False, top_n=top_n)
+    return _rank_by_values(df, _roi(df), "roi", ascending=False, top_n=top_n,
+                           mask=df["budget_musd"] >= 10)
 
 def lowest_roi(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-    temp = df[df["budget_musd"] >= 10].copy()
-    temp["roi"] = temp["revenue_musd"] / temp["budget_musd"]
-    return rank_movies(temp, metric="roi", ascending=True, top_n=top_n)
+    return _rank_by_values(df, _roi(df), "roi", ascending=True, top_n=top_n,
+                           mask=df["budget_musd"] >= 10)
 
 def most_voted(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     return rank_movies(df, metric="vote_count", ascending=False, top_n=top_n)
@@ -60,7 +104,19 @@ def most_popular(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
     return rank_movies(df, metric="popularity", ascending=False, top_n=top_n)
 
 
-def franchise_vs_standalone(df: pd.DataFrame) -> pd.DataFrame:
+def _group_agg(df: pd.DataFrame, key: str, n_workers: int = 1, **aggs) -> pd.DataFrame:
+    """
+    groupby(key).agg(**aggs), hash-partitioned across `n_workers` processes when above 1.
+    Rows with a missing key are left out either way.
+    """
+    if n_workers > 1:
+        from scripts.parallel import partitioned_agg
+        return partitioned_agg(df, key, aggs, n_workers=n_workers)
+
+    return df.groupby(key, observed=True).agg(**aggs)
+
+
+def franchise_vs_standalone(df: pd.DataFrame, n_workers: int = 1) -> pd.DataFrame:
     """
     Compares franchise movies vs standalone movies using:
     - Mean Revenue
@@ -68,13 +124,16 @@ def franchise_vs_standalone(df: pd.DataFrame) -> pd.DataFrame:
     - Mean Budget
     - Mean Popularity
     - Mean Rating
+    With n_workers > 1 each of the two groups is aggregated in its own process.
     """
-    temp = df.copy()
-    temp["is_franchise"] = temp["belongs_to_collection"].notna()
-
-    temp["roi"] = temp["revenue_musd"] / temp["budget_musd"]
+    # Only the aggregated columns are copied, not the whole frame
+    temp = df[["revenue_musd", "budget_musd", "popularity", "vote_average"]].assign(
+        roi=_roi(df),
+        is_franchise=_is_franchise(df),
+    )
 
-    results = temp.groupby("is_franchise").agg(
+    results = _group_agg(
+        temp, "is_franchise", n_workers,
         mean_revenue=("revenue_musd", "mean"),
         median_roi=("roi", "median"),
         mean_budget=("budget_musd", "mean"),
@@ -85,17 +144,17 @@ def franchise_vs_standalone(df: pd.DataFrame) -> pd.DataFrame:
     results.index = ["Standalone", "Franchise"]
     return results
 
-def most_successful_franchises(df: pd.DataFrame) -> pd.DataFrame:
+def most_successful_franchises(df: pd.DataFrame, n_workers: int = 1) -> pd.DataFrame:
     """
     Rank franchises based on:
     - total number of movies
     - total & mean budget
     - total & mean revenue
     - mean rating
+    With n_workers > 1 the franchises are aggregated in parallel processes.
     """
-    temp = df.dropna(subset=["belongs_to_collection"]).copy()
-
-    ranking = temp.groupby("belongs_to_collection").agg(
+    ranking = _group_agg(
+        df, "belongs_to_collection", n_workers,
         movie_count=("id", "count"),
         total_budget=("budget_musd", "sum"),
         mean_budget=("budget_musd", "mean"),
@@ -106,19 +165,113 @@ def most_successful_franchises(df: pd.DataFrame) -> pd.DataFrame:
 
     return ranking.sort_values(by="total_revenue", ascending=False)
 
-def most_successful_directors(df: pd.DataFrame) -> pd.DataFrame:
+def most_successful_directors(df: pd.DataFrame, n_workers: int = 1) -> pd.DataFrame:
     """
     Ranks directors based on:
     - Number of movies directed
     - Total revenue generated
     - Mean rating
+    With n_workers > 1 the directors are aggregated in parallel processes.
     """
-    temp = df.dropna(subset=["director"]).copy()
-
-    ranking = temp.groupby("director").agg(
+    ranking = _group_agg(
+        df, "director", n_workers,
         movie_count=("id", "count"),
         total_revenue=("revenue_musd", "sum"),
         mean_rating=("vote_average", "mean")
     )
 
     return ranking.sort_values(by="total_revenue", ascending=False)
+
+
+# Approximate KPIs
+# Built on the mergeable sketches in scripts.sketches, they accept a frame or an
+# iterable of chunks and keep bounded memory whatever the catalog size.
+
+def _chunks(data: FrameOrChunks) -> Iterable[pd.DataFrame]:
+    return [data] if hasattr(data, "columns") else data
+
+
+def approx_franchise_vs_standalone(data: FrameOrChunks, k: int = 200, seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    franchise_vs_standalone over a frame or streamed chunks.
+    The means are exact, median_roi comes from a KLL sketch per group
+    (rank error below 2% at k=200). The sketches are seeded with `seed`, so the
+    same input gives the same median; None draws a fresh seed on every call.
+    """
+    import pandas as pd
+    from scripts.sketches import KLLSketch
+
+    mean_columns = {
+        "mean_revenue": "revenue_musd",
+        "mean_budget": "budget_musd",
+        "mean_popularity": "popularity",
+        "mean_rating": "vote_average",
+    }
+    sums = {group: dict.fromkeys(mean_columns.values(), 0.0) for group in (False, True)}
+    counts = {group: dict.fromkeys(mean_columns.values(), 0) for group in (False, True)}
+    medians = {group: KLLSketch(k, seed=seed) for group in (False, True)}
+
+    for chunk in _chunks(data):
+        is_franchise = _is_franchise(chunk).to_numpy(dtype=bool)
+        roi = _roi(chunk)
+        for group in (False, True):
+            rows = is_franchise == group
+            for column in mean_columns.values():
+                values = pd.to_numeric(chunk[column][rows], errors="coerce")
+                sums[group][column] += values.sum()
+                counts[group][column] += values.count()
+            medians[group].update(pd.to_numeric(roi[rows], errors="coerce"))
+
+    def mean(group, column):
+        return sums[group][column] / counts[group][column] if counts[group][column] else float("nan")
+
+    results = pd.DataFrame({
+        "mean_revenue": [mean(g, "revenue_musd") for g in (False, True)],
+        "median_roi": [medians[g].quantile(0.5) for g in (False, True)],
+        "mean_budget": [mean(g, "budget_musd") for g in (False, True)],
+        "mean_popularity": [mean(g, "popularity") for g in (False, True)],
+        "mean_rating": [mean(g, "vote_average") for g in (False, True)],
+    })
+    results.index = ["Standalone", "Franchise"]
+    return results
+
+
+def _approx_top(data: FrameOrChunks, column: str, top_n: int, capacity: int) -> pd.DataFrame:
+    from scripts.sketches import FrequentItems
+
+    sketch = FrequentItems(capacity)
+    for chunk in _chunks(data):
+        sketch.update(chunk[column])
+
+    top = sketch.top(top_n).rename(columns={"count": "movie_count"})
+    top.index.name = column
+    return top
+
+
+def approx_top_directors(data: FrameOrChunks, top_n: int = 10, capacity: int = 1000) -> pd.DataFrame:
+    """
+    Directors with the most movies, from a frequent-items sketch of `capacity` counters.
+    `movie_count` is a lower bound, the true count is at most movie_count + max_error,
+    and max_error never exceeds the number of movies / (capacity + 1).
+    """
+    return _approx_top(data, "director", top_n, capacity)
+
+
+def approx_top_franchises(data: FrameOrChunks, top_n: int = 10, capacity: int = 1000) -> pd.DataFrame:
+    """
+    Franchises with the most movies, same error bounds as `approx_top_directors`.
+    """
+    return _approx_top(data, "belongs_to_collection", top_n, capacity)
+
+
+def approx_distinct(data: FrameOrChunks, column: str, precision: int = 12) -> int:
+    """
+    Approximate number of distinct values in `column` from a HyperLogLog sketch,
+    standard error 1.04 / sqrt(2 ** precision) (1.6% by default).
+    """
+    from scripts.sketches import HyperLogLog
+
+    sketch = HyperLogLog(precision)
+    for chunk in _chunks(data):
+        sketch.update(chunk[column])
+    return sketch.count()
@@ -0,0 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Named aggregations as passed to DataFrame.groupby(...).agg(**aggs)
+NamedAggs = Dict[str, Tuple[str, str]]
+
+# Column holding the integer group code shipped to the workers instead of the key itself
+_CODE = "__group_code__"
+
+
+def hash_partitions(df: pd.DataFrame, key: str, n_partitions: int) -> Tuple[List[pd.DataFrame], pd.Index]:
+    """
+    Splits the rows into at most `n_partitions` frames by their group, so every
+    group lands whole in exactly one partition. The key is factorized first and
+    partitions carry the integer code in its place, which is cheaper to ship to
+    and group in worker processes. Returns the partitions and the key values
+    indexed by code. Rows keep their original order and rows with a missing key
+    are dropped, as groupby would.
+    """
+    codes, uniques = pd.factorize(df[key])
+    present = codes >= 0
+    codes = codes[present]
+
+    data = df.drop(columns=[key])[present].assign(**{_CODE: codes})
+    # Codes are dense, so mixing them through a multiplicative hash spreads
+    # neighbouring (often similarly sized) groups across partitions
+    buckets = (codes.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) % np.uint64(n_partitions)
+    partitions = [data[buckets == i] for i in range(n_partitions)]
+    return [part for part in partitions if len(part)], uniques
+
+
+def _aggregate_partition(part: pd.DataFrame, key: str, aggs: NamedAggs) -> pd.DataFrame:
+    return part.groupby(key, observed=True).agg(**aggs)
+
+
+def partitioned_agg(df: pd.DataFrame, key: str, aggs: NamedAggs, n_workers: int = 4) -> pd.DataFrame:
+    """
+    Equivalent of `df.groupby(key).agg(**aggs)` spread over worker processes.
+
+    Rows are hash-partitioned by key, each worker computes the aggregates of its
+    groups, and the partial results are merged by concatenation. Because a group
+    never spans two partitions its sum, count, mean and median are computed over
+    the same values in the same order as a single groupby, so the output is exactly equal.
+    """
+    columns = list(dict.fromkeys([key] + [column for column, _ in aggs.values()]))
+    partitions, uniques = hash_partitions(df[columns], key, n_workers)
+
+    if len(partitions) <= 1:
+        return _aggregate_partition(df[columns], key, aggs)
+
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(partitions))) as executor:
+        results = list(executor.map(_aggregate_partition, partitions, repeat(_CODE), repeat(aggs)))
+
+    merged = pd.concat(results)
+    merged.index = pd.Index(uniques.take(merged.index.to_numpy()), name=key)
+    # groupby returns the groups sorted by key
+    return merged.sort_index()
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+import pandas as pd
+from scripts.index import MovieIndex
+from scripts.text_index import TrigramIndex
+from transform.cleaner import MovieDataCleaner
+from transform.converter import json_to_dataframe
+
+logger = logging.getLogger(__name__)
+
+
+class Dataset(NamedTuple):
+    """One immutable generation of the cleaned movies and the indexes built on them."""
+    df: pd.DataFrame
+    index: Optional[MovieIndex]
+    text_index: Optional[TrigramIndex]
+    version: int
+    built_at: float
+
+
+def build_indexes(df: pd.DataFrame) -> Dict[str, Any]:
+    """Default index builder: range indexes and the trigram name index."""
+    return {"index": MovieIndex(df), "text_index": TrigramIndex.build(df)}
+
+
+def clean_movies(cleaner: MovieDataCleaner) -> MovieDataCleaner:
+    """
+    The standard cleaning of raw TMDB payloads: nested fields flattened to names,
+    numbers and dates converted, budget and revenue in millions, placeholder text,
+    invalid, duplicated, sparse and unreleased movies removed.
+    """
+    return (
+        cleaner
+        .drop_irrelevant(["adult", "imdb_id", "original_title", "video", "homepage"])
+        .extract_single_json_column("belongs_to_collection", "name")
+        .pipe_names(["genres", "spoken_languages", "production_countries", "production_companies", "cast"])
+        .convert_dtypes(
+            numeric_cols=["id", "budget", "revenue", "popularity", "vote_count", "vote_average",
+                          "runtime", "cast_size", "crew_size"],
+            date_cols=["release_date"],
+        )
+        .replace_zero_with_nan(["budget", "revenue", "runtime"])
+        .convert_to_millions(["budget", "revenue"])
+        .fix_vote_count()
+        .clean_text_placeholders(["overview", "tagline"])
+        .remove_invalid_and_duplicated()
+        .keep_min_non_null(10)
+        .filter_and_drop()
+    )
+
+
+def movie_pipeline(
+    movie_ids: Union[List[int], Callable[[], Iterable[int]]],
+    clean: Callable[[MovieDataCleaner], MovieDataCleaner] = clean_movies,
+    fetch_fn: Optional[Callable[[List[int]], Dict[int, Optional[dict]]]] = None,
+) -> Callable[[], pd.DataFrame]:
+    """
+    Returns a build function running extract -> MovieDataCleaner for the refresher.
+    `movie_ids` may be a callable so each refresh picks up a fresh ID list
+    (e.g. from discovery), `clean` applies the cleaning steps to the cleaner
+    (`clean_movies` by default), derived metrics are added and the index is
+    reset at the end.
+    """
+    def build() -> pd.DataFrame:
+        from extract.api import fetch_movies
+
+        ids = list(movie_ids() if callable(movie_ids) else movie_ids)
+        movies = (fetch_fn or fetch_movies)(ids)
+        raw = json_to_dataframe({mid: data for mid, data in movies.items() if data is not None})
+        return clean(MovieDataCleaner(raw)).add_derived_metrics().reset_index().df
+
+    return build
+
+
+class DatasetRefresher():
+    """
+    Periodically rebuilds the movie dataset in the background and swaps it in.
+
+    Double buffered: a refresh builds the new frame and its indexes off to the
+    side while readers keep using the current `Dataset`, then replaces the single
+    reference to it in one assignment. Readers call `current()` once per request
+    and use that generation throughout, so they are never blocked by a refresh
+    and never see a half built one. A failed refresh keeps the previous generation.
+    """
+
+    def __init__(
+        self,
+        build_fn: Callable[[], pd.DataFrame],
+        interval: float = 3600.0,
+        index_fn: Optional[Callable[[pd.DataFrame], Dict[str, Any]]] = build_indexes,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.build_fn = build_fn
+        self.interval = interval
+        self.index_fn = index_fn
+        self.clock = clock
+
+        self._dataset: Optional[Dataset] = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, Any] = {
+            "swap_count": 0,
+            "failure_count": 0,
+            "last_refresh_duration": None,
+            "last_refresh_at": None,
+            "last_error": None,
+        }
+
+    def current(self) -> Dataset:
+        dataset = self._dataset
+        if dataset is None:
+            raise RuntimeError("No dataset has been loaded yet.")
+        return dataset
+
+    def refresh(self) -> bool:
+        """
+        Builds a new generation and swaps it in. Returns False when the build failed
+        or another refresh was already running, True once the new generation is live.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+
+        started = time.perf_counter()
+        try:
+            df = self.build_fn()
+            indexes = self.index_fn(df) if self.index_fn else {}
+            previous = self._dataset
+            dataset = Dataset(
+                df=df,
+                index=indexes.get("index"),
+                text_index=indexes.get("text_index"),
+                version=previous.version + 1 if previous else 1,
+                built_at=self.clock(),
+            )
+            # The swap: one reference assignment, readers holding the old generation keep it
+            self._dataset = dataset
+            self._metrics["swap_count"] += 1
+        except Exception as exc:
+            self._metrics["failure_count"] += 1
+            self._metrics["last_error"] = f"{type(exc).__name__}: {exc}"
+            logger.exception("Dataset refresh failed, keeping the current generation")
+            return False
+        finally:
+            self._metrics["last_refresh_duration"] = time.perf_counter() - started
+            self._metrics["last_refresh_at"] = self.clock()
+            self._refresh_lock.release()
+
+        logger.info(
+            "Swapped in dataset v%d (%d movies) after %.2fs",
+            dataset.version, len(df), self._metrics["last_refresh_duration"],
+        )
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        swap_count, failure_count, last_refresh_duration (seconds), last_refresh_at,
+        last_error, refreshing, version and staleness (seconds since the live
+        generation was built, None before the first one).
+        """
+        dataset = self._dataset
+        return {
+            **self._metrics,
+            "refreshing": self._refresh_lock.locked(),
+            "version": dataset.version if dataset else None,
+            "staleness": self.clock() - dataset.built_at if dataset else None,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "DatasetRefresher":
+        """
+        Starts refreshing in a daemon thread, right away and then every `interval` seconds.
+        Raises RuntimeError while a stopped loop is still finishing its last refresh.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            if not self._stop.is_set():
+                return self
+            raise RuntimeError("The previous refresh loop is still running, stop() it first.")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background loop, waiting up to `timeout` for a running refresh to
+        finish. If it is still running afterwards the loop exits once it is done.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
@@ -1,5 +1,15 @@
-import pandas as pd
-from typing import Callable
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# pandas is only needed for the annotations, callers already have it loaded
+if TYPE_CHECKING:
+    import pandas as pd
+    from scripts.index import MovieIndex, Range
+    from scripts.text_index import TrigramIndex
+
+# A batch query: column -> predicate, plus the optional "sort_by" and "ascending" keys
+QuerySpec = Dict[str, Any]
+_SORT_KEYS = ("sort_by", "ascending")
 
 
 
@@ -13,6 +23,205 @@ def apply_filter(df: pd.DataFrame, condition: Callable[[pd.DataFrame], pd.Series
     return df[condition(df)]
 
 
+def range_filter(
+    df: pd.DataFrame,
+    ranges: Dict[str, Range],
+    index: Optional[MovieIndex] = None,
+    inclusive: str = "both",
+) -> pd.DataFrame:
+    """
+    Filters the DataFrame on numeric or date ranges, e.g.
+    `{"release_date": ("2010-01-01", "2015-12-31"), "vote_average": (7, None, "neither")}`.
+    Each range is (low, high) or (low, high, inclusive), a None bound leaves that side open.
+    With a `MovieIndex` built on df the indexed columns are resolved by binary search,
+    any other column falls back to a boolean scan of the already narrowed rows.
+    """
+    from scripts.index import split_range, range_mask
+
+    indexed = {col: r for col, r in ranges.items() if index is not None and col in index}
+    scanned = {col: r for col, r in ranges.items() if col not in indexed}
+
+    result = index.select(df, indexed, inclusive) if indexed else df
+    for column, bounds in scanned.items():
+        low, high, side = split_range(bounds, inclusive)
+        result = result[range_mask(result[column], low, high, side)]
+    return result
+
+
+
+def fuzzy_search(
+    df: pd.DataFrame,
+    query: str,
+    index: Optional[TrigramIndex] = None,
+    fields: Optional[Iterable[str]] = None,
+    top_n: int = 10,
+    min_score: float = 0.6,
+) -> pd.DataFrame:
+    """
+    Approximate search over titles, cast and director names, tolerant to typos
+    ("tarantino", "bruce wilis"). Pass a `TrigramIndex` built (or loaded) once for df,
+    without one the index is built on the fly.
+    Returns the matching movies, best match first, with the matched `match`,
+    `match_field` and `match_score` attached.
+    """
+    from scripts.text_index import TrigramIndex
+
+    if index is None:
+        index = TrigramIndex.build(df, fields)
+    elif index.n_rows != len(df):
+        raise ValueError("The index was built for a different frame.")
+
+    best = {}
+    for match in index.search(query, top_n=top_n, fields=fields, min_score=min_score):
+        for row in match.rows.tolist():
+            best.setdefault(row, match)
+
+    positions = list(best)
+    result = df.iloc[positions]
+    return result.assign(
+        match=[best[p].term for p in positions],
+        match_field=[best[p].field for p in positions],
+        match_score=[best[p].score for p in positions],
+    )
+
+
+def _contains_masks(column: pd.Series, needles: Iterable[str]) -> Dict[str, Any]:
+    """
+    Case-insensitive substring masks for several needles over one column.
+    The column is factorized once and each needle is only tested against the
+    distinct values, the hits are spread back to the rows through the codes.
+    For "|" joined columns (cast, genres) a needle without "|" can only match
+    inside one name, so it is tested against the even smaller set of distinct names.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, uniques = column.array.codes, column.cat.categories
+    else:
+        codes, uniques = pd.factorize(column)
+    lowered = pd.Series(uniques, dtype=object).str.lower()
+
+    names = None
+    if lowered.str.contains("|", regex=False).any():
+        tokens = lowered.str.split("|").explode()
+        name_codes, vocabulary = pd.factorize(tokens.to_numpy())
+        owners = tokens.index.to_numpy()
+        names = pd.Series(vocabulary, dtype=object)
+
+    masks = {}
+    for needle in needles:
+        needle_lower = needle.lower()
+        if names is not None and "|" not in needle_lower:
+            name_hits = names.str.contains(needle_lower, regex=False).to_numpy(dtype=bool)
+            hits = np.zeros(len(uniques), dtype=bool)
+            hits[owners[name_hits[name_codes]]] = True
+        else:
+            hits = lowered.str.contains(needle_lower, regex=False, na=False).to_numpy(dtype=bool)
+        # Code -1 (missing value) picks the trailing False
+        masks[needle] = np.append(hits, False)[codes]
+    return masks
+
+
+def _parse_predicate(column: str, predicate, series: pd.Series) -> Tuple[str, Union[tuple, List[str]]]:
+    """
+    Splits a `search_batch` predicate into ("range", bounds) or ("contains", needles).
+    The column's dtype decides how a list is read, since ranges decoded from JSON
+    arrive as lists (of strings, for dates): on a numeric or datetime column a list
+    of two or three items is a range, on a text column a list of strings are needles.
+    """
+    import pandas as pd
+    from scripts.index import INCLUSIVE_SIDES
+
+    is_range_column = (
+        pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    ) or pd.api.types.is_datetime64_any_dtype(series.dtype)
+
+    if isinstance(predicate, tuple) or (is_range_column and isinstance(predicate, list)):
+        if len(predicate) in (2, 3) and (len(predicate) == 2 or predicate[2] in INCLUSIVE_SIDES):
+            return "range", tuple(predicate)
+    elif not is_range_column:
+        if isinstance(predicate, str):
+            return "contains", [predicate]
+        if isinstance(predicate, list) and all(isinstance(term, str) for term in predicate):
+            return "contains", list(predicate)
+
+    expected = "a (low, high[, inclusive]) range" if is_range_column else \
+        "a string, a list of strings or a (low, high[, inclusive]) range"
+    raise ValueError(f"Unsupported predicate for column '{column}': {predicate!r}. Use {expected}.")
+
+
+def search_batch(
+    df: pd.DataFrame,
+    queries: List[QuerySpec],
+    index: Optional[MovieIndex] = None,
+    inclusive: str = "both",
+) -> List[pd.DataFrame]:
+    """
+    Runs many searches over the same DataFrame in one go, e.g.
+    `[{"cast": "Bruce Willis", "genres": ["Action", "Science Fiction"]},
+      {"genres": "Action", "vote_average": (7, None), "sort_by": "vote_average", "ascending": False}]`.
+
+    Predicates per column:
+    - a string: the column contains it, case-insensitive
+    - a list of strings: the column contains all of them
+    - a tuple, or on a numeric or datetime column a list of two or three items:
+      a range as in `range_filter`, resolved through `index` when it covers the column
+    Any other predicate raises a ValueError naming the column.
+    Every distinct predicate is evaluated once for the whole batch and shared between
+    queries, and all substring predicates on a column share one pass over its distinct values.
+    Returns one filtered DataFrame per query, in order.
+    """
+    import numpy as np
+    from scripts.index import range_mask, split_range
+
+    if index is not None and index.n_rows != len(df):
+        raise ValueError("The index was built for a different frame.")
+
+    parsed = [
+        [(column, *_parse_predicate(column, predicate, df[column]))
+         for column, predicate in query.items() if column not in _SORT_KEYS]
+        for query in queries
+    ]
+
+    needles: Dict[str, set] = {}
+    ranges: Dict[tuple, tuple] = {}
+    for predicates in parsed:
+        for column, kind, value in predicates:
+            if kind == "range":
+                bounds = split_range(value, inclusive)
+                ranges[(column, bounds)] = bounds
+            else:
+                needles.setdefault(column, set()).update(value)
+
+    contains = {column: _contains_masks(df[column], terms) for column, terms in needles.items()}
+
+    range_masks = {}
+    for (column, bounds), (low, high, side) in ranges.items():
+        if index is not None and column in index:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[index.lookup({column: (low, high, side)})] = True
+        else:
+            mask = range_mask(df[column], low, high, side).to_numpy()
+        range_masks[(column, bounds)] = mask
+
+    results = []
+    for query, predicates in zip(queries, parsed):
+        mask = np.ones(len(df), dtype=bool)
+        for column, kind, value in predicates:
+            if kind == "range":
+                mask &= range_masks[(column, split_range(value, inclusive))]
+            else:
+                for term in value:
+                    mask &= contains[column][term]
+
+        result = df[mask]
+        if "sort_by" in query:
+            result = result.sort_values(by=query["sort_by"], ascending=query.get("ascending", True))
+        results.append(result)
+
+    return results
+
 
 def search_sci_fi(df: pd.DataFrame) -> pd.DataFrame:
     """
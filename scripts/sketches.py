@@ -0,0 +1,197 @@
+"""
+Mergeable sketches for approximate KPIs over very large or streamed catalogs.
+
+Every sketch takes values in batches with `update` and can absorb another sketch
+of the same kind with `merge`, so chunks can be summarised separately (in other
+processes or as they stream in) and combined afterwards.
+
+Error bounds, with n the number of values seen:
+- KLLSketch(k): quantiles with a normalised rank error below 2% at the default
+  k=200 with high probability, shrinking roughly in proportion to 1 / k,
+  independent of n.
+- FrequentItems(capacity): each count is under-estimated by at most
+  `max_error`, which never exceeds n / (capacity + 1). Every item occurring
+  more than that many times is retained.
+- HyperLogLog(precision): distinct counts with a standard error of
+  1.04 / sqrt(2 ** precision), 1.6% at the default precision of 12.
+"""
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values) -> np.ndarray:
+    """64-bit hashes of the values, stable across processes and runs."""
+    return pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Vectorised int.bit_length for uint64 arrays."""
+    x = x.copy()
+    length = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        x[high] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+class KLLSketch():
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty). Level h holds items of weight
+    2**h; a full level is sorted and every other item, from a random offset,
+    is promoted to the next level. Keeps O(k) items whatever the stream length.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the total weight is preserved
+                kept, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = kept
+            level += 1
+
+    def update(self, values) -> "KLLSketch":
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2 ** h, dtype=np.int64) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile, NaN for an empty sketch."""
+        items, cumulative = self._weighted()
+        if not len(items):
+            return float("nan")
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[min(position, len(items) - 1)])
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of the values that are <= value."""
+        items, cumulative = self._weighted()
+        if not len(items):
+            return float("nan")
+        position = np.searchsorted(items, value, side="right")
+        return float(cumulative[position - 1] / cumulative[-1]) if position else 0.0
+
+
+class FrequentItems():
+    """
+    Misra-Gries frequent items summary, the counter-based family Space-Saving belongs to.
+    Holds at most `capacity` counters. Batches are counted exactly and merged in:
+    when more than `capacity` counters remain, the (capacity + 1)-th largest count
+    is subtracted from all of them and the non-positive ones are dropped.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.n = 0
+        self.max_error = 0
+        self.counts = pd.Series(dtype="int64")
+
+    def _absorb(self, counts: pd.Series, n: int, error: int) -> "FrequentItems":
+        combined = self.counts.add(counts, fill_value=0).astype("int64")
+        self.n += n
+        self.max_error += error
+
+        if len(combined) > self.capacity:
+            cutoff = int(np.partition(combined.to_numpy(), len(combined) - self.capacity - 1)[
+                len(combined) - self.capacity - 1])
+            combined = combined - cutoff
+            combined = combined[combined > 0]
+            self.max_error += cutoff
+
+        self.counts = combined
+        return self
+
+    def update(self, values) -> "FrequentItems":
+        counts = pd.Series(values).value_counts(dropna=True)
+        # Categorical columns report every category, even those not in this batch
+        counts = counts[counts > 0]
+        return self._absorb(counts, int(counts.sum()), 0)
+
+    def merge(self, other: "FrequentItems") -> "FrequentItems":
+        return self._absorb(other.counts, other.n, other.max_error)
+
+    def top(self, n: int = 10) -> pd.DataFrame:
+        """
+        The n items with the highest estimated counts. `count` is a lower bound,
+        the true count is at most `count + max_error`.
+        """
+        # Sort by count, then by item, so ties come out in a stable order
+        top = self.counts.sort_index(kind="stable").sort_values(ascending=False, kind="stable").head(n)
+        return pd.DataFrame({"count": top, "max_error": self.max_error})
+
+
+class HyperLogLog():
+    """
+    HyperLogLog distinct counter over 64-bit hashes with 2 ** precision registers.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        values = pd.Series(values).dropna()
+        if not len(values):
+            return self
+
+        hashes = hash_values(values)
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        remainder = hashes << p
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        ranks = np.minimum(64 - _bit_length(remainder) + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype("float64")))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
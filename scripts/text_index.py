@@ -0,0 +1,255 @@
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# Separator for the persisted term blob, never part of a cleaned title or name
+_TERM_SEPARATOR = "\x00"
+
+
+class TermMatch(NamedTuple):
+    term: str
+    field: str
+    score: float
+    rows: np.ndarray
+
+
+def _encode_strings(values: List[str]) -> np.ndarray:
+    return np.frombuffer(_TERM_SEPARATOR.join(values).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_strings(blob: np.ndarray) -> List[str]:
+    text = blob.tobytes().decode("utf-8")
+    return text.split(_TERM_SEPARATOR) if text else []
+
+
+def normalize(text: str) -> str:
+    """Lowercases, strips accents and collapses whitespace so that
+    "Amélie" and "amelie " produce the same trigrams."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+def trigrams(text: str) -> set:
+    """Word-level trigrams, each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two short strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def similarity(query: str, term: str) -> float:
+    """
+    Edit similarity between the query and the best matching run of words in the term,
+    so "tarantino" scores 1.0 against "quentin tarantino".
+    """
+    q_words, t_words = query.split(), term.split()
+    width = min(len(q_words), len(t_words))
+    best = 0.0
+    for start in range(len(t_words) - width + 1):
+        window = " ".join(t_words[start:start + width])
+        distance = edit_distance(query, window)
+        best = max(best, 1 - distance / max(len(query), len(window)))
+    return best
+
+
+class TrigramIndex():
+    """
+    A trigram index over titles and person names of a cleaned movie frame.
+
+    Every distinct title, cast member and director is a term. A query collects
+    candidate terms through the trigram postings, ranks them by trigram overlap
+    and reranks the best ones by edit similarity. Built once with `build`,
+    persisted with `save` and reloaded with `load`.
+    """
+
+    DEFAULT_FIELDS = ("title", "cast", "director")
+    # Fields holding several names joined with "|" by MovieDataCleaner.pipe_names
+    MULTI_VALUE_FIELDS = ("cast", "genres")
+
+    def __init__(
+        self,
+        terms: List[str],
+        fields: List[str],
+        term_fields: np.ndarray,
+        row_offsets: np.ndarray,
+        rows: np.ndarray,
+        grams: List[str],
+        gram_offsets: np.ndarray,
+        gram_terms: np.ndarray,
+        n_rows: int,
+        normalized: Optional[List[str]] = None,
+    ):
+        self.terms = terms
+        self.fields = fields
+        self.term_fields = term_fields
+        self.row_offsets = row_offsets
+        self.rows = rows
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_terms = gram_terms
+        self.n_rows = n_rows
+
+        self._gram_ids: Dict[str, int] = {gram: i for i, gram in enumerate(grams)}
+        self.normalized = normalized if normalized is not None else [normalize(t) for t in terms]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, fields: Optional[Sequence[str]] = None) -> "TrigramIndex":
+        fields = [f for f in (fields or cls.DEFAULT_FIELDS) if f in df.columns]
+
+        term_ids: Dict[Tuple[int, str], int] = {}
+        terms, term_fields, term_rows = [], [], []
+
+        for field_id, field in enumerate(fields):
+            split = field in cls.MULTI_VALUE_FIELDS
+            for row, cell in enumerate(df[field].tolist()):
+                if not isinstance(cell, str):
+                    continue
+                for value in (cell.split("|") if split else [cell]):
+                    key = (field_id, normalize(value))
+                    if not key[1]:
+                        continue
+                    term_id = term_ids.get(key)
+                    if term_id is None:
+                        term_id = term_ids[key] = len(terms)
+                        terms.append(value.strip())
+                        term_fields.append(field_id)
+                        term_rows.append([])
+                    term_rows[term_id].append(row)
+
+        row_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        row_offsets[1:] = np.cumsum([len(r) for r in term_rows])
+        rows = np.fromiter((r for rs in term_rows for r in rs), dtype=np.int64, count=row_offsets[-1])
+
+        gram_ids: Dict[str, int] = {}
+        pair_grams, pair_terms = [], []
+        for (_, norm), term_id in term_ids.items():
+            for gram in trigrams(norm):
+                pair_grams.append(gram_ids.setdefault(gram, len(gram_ids)))
+                pair_terms.append(term_id)
+
+        pair_grams = np.asarray(pair_grams, dtype=np.int64)
+        order = np.argsort(pair_grams, kind="stable")
+        gram_terms = np.asarray(pair_terms, dtype=np.int64)[order]
+        gram_offsets = np.zeros(len(gram_ids) + 1, dtype=np.int64)
+        gram_offsets[1:] = np.cumsum(np.bincount(pair_grams, minlength=len(gram_ids)))
+
+        return cls(
+            terms=terms,
+            fields=list(fields),
+            term_fields=np.asarray(term_fields, dtype=np.int8),
+            row_offsets=row_offsets,
+            rows=rows,
+            grams=list(gram_ids),
+            gram_offsets=gram_offsets,
+            gram_terms=gram_terms,
+            n_rows=len(df),
+            normalized=[norm for (_, norm) in term_ids],
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persists the index as a single uncompressed `.npz` file for fast reload."""
+        with open(path, "wb") as fh:
+            np.savez(
+                fh,
+                terms=_encode_strings(self.terms),
+                normalized=_encode_strings(self.normalized),
+                fields=np.asarray(self.fields),
+                term_fields=self.term_fields,
+                row_offsets=self.row_offsets,
+                rows=self.rows,
+                grams=np.asarray(self.grams),
+                gram_offsets=self.gram_offsets,
+                gram_terms=self.gram_terms,
+                n_rows=np.asarray(self.n_rows),
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TrigramIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                terms=_decode_strings(data["terms"]),
+                normalized=_decode_strings(data["normalized"]),
+                fields=data["fields"].tolist(),
+                term_fields=data["term_fields"],
+                row_offsets=data["row_offsets"],
+                rows=data["rows"],
+                grams=data["grams"].tolist(),
+                gram_offsets=data["gram_offsets"],
+                gram_terms=data["gram_terms"],
+                n_rows=int(data["n_rows"]),
+            )
+
+    def term_rows(self, term_id: int) -> np.ndarray:
+        return self.rows[self.row_offsets[term_id]:self.row_offsets[term_id + 1]]
+
+    def search(
+        self,
+        query: str,
+        top_n: int = 10,
+        fields: Optional[Iterable[str]] = None,
+        min_score: float = 0.6,
+        candidates: int = 50,
+        min_overlap: float = 0.3,
+    ) -> List[TermMatch]:
+        """
+        Returns up to `top_n` terms matching the query, best first.
+        Terms sharing at least `min_overlap` of the query trigrams are candidates,
+        the `candidates` sharing the most are reranked by edit similarity
+        and kept when it reaches `min_score`.
+        """
+        norm = normalize(query)
+        gram_ids = [self._gram_ids[g] for g in trigrams(norm) if g in self._gram_ids]
+        if not gram_ids:
+            return []
+
+        postings = np.concatenate([
+            self.gram_terms[self.gram_offsets[g]:self.gram_offsets[g + 1]] for g in gram_ids
+        ])
+        # Counting with bincount avoids sorting the postings, and terms sharing
+        # too few trigrams with the query cannot reach min_score anyway
+        shared = np.bincount(postings, minlength=len(self.terms))
+        term_ids = np.flatnonzero(shared >= max(1, int(len(gram_ids) * min_overlap)))
+        overlap = shared[term_ids]
+
+        if fields is not None:
+            wanted = [self.fields.index(f) for f in fields if f in self.fields]
+            keep = np.isin(self.term_fields[term_ids], wanted)
+            term_ids, overlap = term_ids[keep], overlap[keep]
+
+        if len(term_ids) > candidates:
+            best = np.argpartition(-overlap, candidates - 1)[:candidates]
+            term_ids, overlap = term_ids[best], overlap[best]
+
+        matches = []
+        for term_id, shared in zip(term_ids.tolist(), overlap.tolist()):
+            score = similarity(norm, self.normalized[term_id])
+            if score >= min_score:
+                matches.append((score, shared, term_id))
+
+        # Ties on edit similarity go to the term sharing more trigrams, then the shorter term
+        matches.sort(key=lambda m: (-m[0], -m[1], len(self.terms[m[2]])))
+        return [
+            TermMatch(self.terms[t], self.fields[self.term_fields[t]], score, self.term_rows(t))
+            for score, _, t in matches[:top_n]
+        ]
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -10,9 +11,19 @@ class Settings(BaseSettings):
     
     TMDB_API_KEY: str
     TMDB_API_URL: str
-    
-    
-settings = Settings()
-    
-    
-    
\ No newline at end of file
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Builds the settings on first use instead of at import time,
+    so importing a module never reads `.env` or fails on missing keys.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Keeps `from settings.config import settings` working, now resolved lazily
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
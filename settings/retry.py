@@ -0,0 +1,46 @@
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from settings.utils import RetryBudget, RetryBudgetExhausted
+
+
+class BudgetedRetry(Retry):
+    """
+    urllib3 retry policy that only retries while the shared `RetryBudget` can pay for it.
+    A denied retry ends the request right away, without the backoff sleep. When the
+    retry was for a retryable status, that response is returned with
+    `retry_budget_exhausted = True` set on it (`requests.Response.raw`).
+    """
+
+    def __init__(self, *args, budget: RetryBudget = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+
+    def new(self, **kw) -> "BudgetedRetry":
+        # urllib3 builds a fresh Retry for every attempt, the budget has to travel along
+        kw.setdefault("budget", self.budget)
+        return super().new(**kw)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+
+        if self.budget is not None and not self.budget.try_spend():
+            if response is not None:
+                # urllib3 hands this response back as the result, the flag tells why it was not retried
+                response.retry_budget_exhausted = True
+            cause = error or (f"http {response.status}" if response is not None else "unknown error")
+            raise MaxRetryError(_pool, url, RetryBudgetExhausted(f"retry budget exhausted after {cause}"))
+        return retry
+
+
+class BudgetedAdapter(HTTPAdapter):
+    """HTTP adapter depositing into the retry budget for every request it sends."""
+
+    def __init__(self, budget: RetryBudget, **kwargs):
+        self.budget = budget
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.budget.deposit()
+        return super().send(request, **kwargs)
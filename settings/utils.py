@@ -1,34 +1,65 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, List, Dict, Any
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Any, Hashable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 def get_retry_session(
     retries: int = 5,
     backoff_factor: float = 1,
     status_forcelist: List[int] = None,
-    allowed_methods: List[str] = None
+    allowed_methods: List[str] = None,
+    budget: Optional["RetryBudget"] = None,
 ):
     """
-    A retry-session logic with backoff and jitter
+    A retry-session logic with backoff and jitter.
+    With a `budget`, every retry also has to be paid for from the shared `RetryBudget`.
+    Once retries run out the last response is returned as is, so the caller sees its status.
     """
+    # requests is imported on first use to keep it out of the import-time cost
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     session = requests.Session()
 
-    retry = Retry(
+    retry_kwargs = dict(
         total=retries,
         backoff_factor=backoff_factor,
         status_forcelist=status_forcelist or [429, 500, 502, 503, 504],
         allowed_methods=allowed_methods or ["GET"],
+        raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry)
+    if budget is None:
+        adapter = HTTPAdapter(max_retries=Retry(**retry_kwargs))
+    else:
+        from settings.retry import BudgetedAdapter, BudgetedRetry
+        adapter = BudgetedAdapter(budget, max_retries=BudgetedRetry(budget=budget, **retry_kwargs))
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
     return session
 
+def iter_threaded(
+    worker_fn: Callable[[Any], Any],
+    items: List[Any],
+    max_workers: int = 10
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Runs the worker in parallel and yields (input, result) pairs
+    as soon as each one completes, so callers can act on partial progress.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(worker_fn, item): item for item in items}
+
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
 def run_threaded(
     worker_fn: Callable[[Any], Any],
     items: List[Any],
@@ -40,11 +71,179 @@ def run_threaded(
     """
     results: Dict[Any, Any] = {}
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(worker_fn, item): item for item in items}
-
-        for future in as_completed(futures):
-            key = futures[future]
-            results[key] = future.result()
+    for key, result in iter_threaded(worker_fn, items, max_workers=max_workers):
+        results[key] = result
 
     return results
+
+class SingleFlight():
+    """
+    Collapses concurrent calls for the same key into one execution.
+    The first caller for a key runs the function, every caller that arrives
+    while it is still running waits for and shares that same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+        return future.result()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+
+class RetryBudgetExhausted(Exception):
+    """Raised in place of a retry the shared `RetryBudget` could not pay for."""
+
+
+class RetryBudget():
+    """
+    Caps retries at a fraction of the requests made, shared by every thread using it.
+    Each request deposits `ratio` of a token and each retry spends a whole one, so
+    over time retries stay below `ratio` of the traffic. `reserve` tokens are there
+    from the start, for a client that has not sent much yet, and the balance never
+    grows past it, so a long healthy run cannot save up for a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "retries_denied": 0}
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            # Tolerates the rounding of summed fractional deposits
+            if self._balance < 1 - 1e-9:
+                self.stats["retries_denied"] += 1
+                return False
+            self._balance -= 1
+            self.stats["retries"] += 1
+            return True
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+
+class CircuitBreaker():
+    """
+    Fails fast while the error rate is high instead of queueing more calls behind it.
+
+    Closed: calls go through and the outcomes of the last `window` calls are kept.
+    Once at least `min_calls` are recorded and the failure share reaches
+    `failure_rate` the breaker opens and `allow` refuses every call. After
+    `cooldown` seconds it is half open and lets a single probe through, whose
+    success closes it again and whose failure opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 50,
+        min_calls: int = 20,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.stats: Dict[str, int] = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+                self._probing = False
+
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            self.stats["rejected"] += 1
+            return False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+        self._probing = False
+        self.stats["opened"] += 1
+        logger.warning("Circuit opened, failing fast for %.0fs", self.cooldown)
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if success:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("Circuit closed after a successful probe")
+                else:
+                    self._open()
+                return
+            if self._state == self.OPEN:
+                # A call allowed before the breaker opened finishing late
+                return
+
+            self._outcomes.append(success)
+            failures = len(self._outcomes) - sum(self._outcomes)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = 0
@@ -0,0 +1,14 @@
+import pytest
+from settings.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def tmdb_settings(monkeypatch):
+    """
+    Placeholder TMDB settings so the suite runs without a `.env` file.
+    """
+    monkeypatch.setenv("TMDB_API_KEY", "test-key")
+    monkeypatch.setenv("TMDB_API_URL", "https://api.themoviedb.org/3")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
@@ -1,6 +1,9 @@
+import threading
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
-from extract.api import fetch_movies
+from extract.api import fetch_movies, fetch_movie_result, fetch_stats, reset_fetch_stats
 
 @patch("extract.api.session.get")
 def test_fetch_movies_success(mock_get):
@@ -26,3 +29,127 @@ def test_fetch_movies_failure(mock_get):
 
     movies = fetch_movies([999])
     assert movies[999] is None
+
+
+@patch("extract.api.session.get")
+def test_fetch_movie_result_keeps_reason(mock_get):
+    fake_response = MagicMock()
+    fake_response.status_code = 503
+
+    mock_get.return_value = fake_response
+
+    result = fetch_movie_result(42)
+    assert result.data is None
+    assert result.error.kind == "http_5xx"
+    assert result.error.status == 503
+    assert result.error.transient
+
+
+@patch("extract.api.session.get")
+def test_fetch_movies_collapses_duplicate_ids(mock_get):
+    fake_response = MagicMock()
+    fake_response.status_code = 200
+    fake_response.json.side_effect = lambda: {"title": "Fake Movie", "credits": {}}
+
+    mock_get.return_value = fake_response
+    reset_fetch_stats()
+
+    movies = fetch_movies([7, 8, 7, 7])
+
+    assert set(movies) == {7, 8}
+    assert mock_get.call_count == 2
+    assert fetch_stats()["deduplicated"] == 2
+
+
+@patch("extract.api.session.get")
+def test_concurrent_fetches_share_one_request(mock_get):
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=5)
+        fake_response = MagicMock()
+        fake_response.status_code = 200
+        fake_response.json.return_value = {"title": "Fake Movie", "credits": {}}
+        return fake_response
+
+    mock_get.side_effect = slow_get
+    reset_fetch_stats()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(fetch_movie_result, 21) for _ in range(4)]
+        # Wait until every caller has joined the in-flight request
+        while fetch_stats()["calls"] < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert mock_get.call_count == 1
+    assert all(r.data["title"] == "Fake Movie" for r in results)
+    assert fetch_stats()["executed"] == 1
+    assert fetch_stats()["coalesced"] == 3
+
+
+@patch("extract.api.extract_credit_info", side_effect=AssertionError("called in a fetch thread"))
+@patch("extract.api.session.get")
+def test_fetch_movies_extracts_credits_in_one_batch(mock_get, _per_movie):
+    fake_response = MagicMock()
+    fake_response.status_code = 200
+    fake_response.json.side_effect = lambda: {
+        "title": "Fake Movie",
+        "credits": {"cast": [{"name": "Uma Thurman"}], "crew": [{"name": "Quentin Tarantino", "job": "Director"}]},
+    }
+    mock_get.return_value = fake_response
+
+    movies = fetch_movies([1, 2])
+
+    assert movies[1]["director"] == "Quentin Tarantino"
+    assert movies[2]["cast"] == ["Uma Thurman"]
+    assert movies[2]["crew_size"] == 1
+
+
+@patch("extract.api.session.get")
+def test_callers_with_and_without_credits_share_one_request(mock_get):
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=5)
+        fake_response = MagicMock()
+        fake_response.status_code = 200
+        fake_response.json.return_value = {
+            "title": "Fake Movie",
+            "credits": {"crew": [{"name": "Quentin Tarantino", "job": "Director"}]},
+        }
+        return fake_response
+
+    mock_get.side_effect = slow_get
+    reset_fetch_stats()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with_credits = executor.submit(fetch_movie_result, 22)
+        raw = executor.submit(fetch_movie_result, 22, False)
+        while fetch_stats()["calls"] < 2:
+            time.sleep(0.001)
+        release.set()
+
+    assert mock_get.call_count == 1
+    assert fetch_stats()["coalesced"] == 1
+    assert with_credits.result().data["director"] == "Quentin Tarantino"
+    # The shared payload itself is left as TMDB sent it
+    assert "director" not in raw.result().data
+
+
+@patch("extract.api.session.get")
+def test_fetch_movies_keeps_other_movies_when_credits_are_malformed(mock_get):
+    def get(url, **kwargs):
+        fake_response = MagicMock()
+        fake_response.status_code = 200
+        cast = [None] if url.endswith("/2") else [{"name": "Uma Thurman"}]
+        fake_response.json.return_value = {"title": "Fake Movie", "credits": {"cast": cast}}
+        return fake_response
+
+    mock_get.side_effect = get
+
+    movies = fetch_movies([1, 2])
+
+    assert movies[1]["cast"] == ["Uma Thurman"]
+    assert movies[2] is None
@@ -143,3 +143,31 @@ def test_reset_index():
     cleaner = MovieDataCleaner(df).reset_index()
 
     assert cleaner.df.index.tolist() == [0, 1]
+
+
+def test_add_derived_metrics():
+    df = pd.DataFrame({
+        "budget_musd": [10.0, 0.0, None],
+        "revenue_musd": [30.0, 5.0, 8.0],
+        "belongs_to_collection": ["Saga", None, None],
+    })
+
+    cleaner = MovieDataCleaner(df).add_derived_metrics()
+
+    assert cleaner.df["profit"].tolist()[:2] == [20.0, 5.0]
+    assert cleaner.df["roi"].iloc[0] == 3.0
+    # Zero and missing budgets give NaN instead of inf
+    assert pd.isna(cleaner.df["roi"].iloc[1])
+    assert pd.isna(cleaner.df["roi"].iloc[2])
+    assert cleaner.df["roi"].dtype == "float64"
+    assert cleaner.df["is_franchise"].tolist() == [True, False, False]
+
+
+def test_add_derived_metrics_handles_nullable_columns():
+    df = pd.DataFrame({"budget_musd": [4, 0], "revenue_musd": [12, 3]})
+
+    cleaner = MovieDataCleaner(df).replace_zero_with_nan(["budget_musd"]).add_derived_metrics()
+
+    assert cleaner.df["profit"].dtype == "float64"
+    assert cleaner.df["roi"].iloc[0] == 3.0
+    assert pd.isna(cleaner.df["profit"].iloc[1])
@@ -0,0 +1,64 @@
+import copy
+import pytest
+from transform.credits import attach_credits, extract_credit_info
+
+
+@pytest.fixture
+def payloads():
+    return {
+        1: {"title": "Pulp Fiction", "credits": {
+            "cast": [{"name": "John Travolta"}, {"name": "Uma Thurman"}, {"character": "Unnamed"}],
+            "crew": [
+                {"name": "Lawrence Bender", "job": "Producer"},
+                {"name": "Quentin Tarantino", "job": "Director"},
+                {"name": "Someone Else", "job": "Director"},
+            ],
+        }},
+        2: {"title": "No Credits"},
+        3: None,
+        4: {"title": "No Director", "credits": {
+            "cast": [{"name": None}],
+            "crew": [{"name": "Editor", "job": "Editor"}, {"job": "Sound"}],
+        }},
+        5: {"title": "Nameless Director", "credits": {"cast": [], "crew": [{"job": "Director"}]}},
+        6: {"title": "Null Credits", "credits": None},
+    }
+
+
+def test_extract_credit_info(payloads):
+    assert extract_credit_info(payloads[1]) == {
+        "cast": ["John Travolta", "Uma Thurman"],
+        "cast_size": 2,
+        "director": "Quentin Tarantino",
+        "crew_size": 3,
+    }
+    assert extract_credit_info(payloads[4])["cast"] == [None]
+    assert extract_credit_info(payloads[4])["director"] is None
+    assert extract_credit_info(payloads[5])["director"] is None
+
+    empty = {"cast": [], "cast_size": 0, "director": None, "crew_size": 0}
+    assert extract_credit_info(payloads[2]) == empty
+    assert extract_credit_info(payloads[6]) == empty
+
+
+def test_attach_credits_updates_payloads_like_per_movie(payloads):
+    expected = copy.deepcopy(payloads)
+    for movie in expected.values():
+        if movie is not None:
+            movie.update(extract_credit_info(movie))
+
+    assert attach_credits(payloads) == expected
+
+
+def test_attach_credits_handles_no_payloads():
+    assert attach_credits({3: None}) == {3: None}
+    assert attach_credits({}) == {}
+
+
+def test_attach_credits_drops_only_malformed_payloads(payloads):
+    payloads[7] = {"title": "Broken", "credits": {"cast": [None]}}
+
+    movies = attach_credits(payloads)
+
+    assert movies[7] is None
+    assert movies[1]["director"] == "Quentin Tarantino"
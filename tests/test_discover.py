@@ -0,0 +1,87 @@
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from extract.discover import discover_movie_ids, fetch_discover_page, fetch_discovered
+
+
+class PagedStub:
+    """
+    Local stand-in for a paginated TMDB list endpoint.
+    Page N returns IDs N*10 .. N*10+2, `total_pages` pages in total.
+    """
+    def __init__(self, total_pages=5, failing=()):
+        self.total_pages = total_pages
+        self.failing = set(failing)
+        self.requested = []
+
+    def __call__(self, page):
+        self.requested.append(page)
+        if page in self.failing:
+            raise RuntimeError("page unavailable")
+        return {
+            "page": page,
+            "total_pages": self.total_pages,
+            "results": [{"id": page * 10 + i} for i in range(3)],
+        }
+
+
+def test_discover_movie_ids_walks_every_page():
+    stub = PagedStub(total_pages=5)
+
+    ids = list(discover_movie_ids(page_fetcher=stub, max_workers=2, prefetch=2))
+
+    assert sorted(stub.requested) == [1, 2, 3, 4, 5]
+    assert sorted(ids) == sorted(p * 10 + i for p in range(1, 6) for i in range(3))
+
+
+def test_discover_movie_ids_respects_max_pages():
+    stub = PagedStub(total_pages=50)
+
+    ids = list(discover_movie_ids(page_fetcher=stub, max_pages=3))
+
+    assert sorted(stub.requested) == [1, 2, 3]
+    assert len(ids) == 9
+
+
+def test_discover_movie_ids_skips_duplicates_and_failed_pages():
+    stub = PagedStub(total_pages=3, failing={2})
+    stub_with_repeat = lambda page: (
+        {"total_pages": 3, "results": [{"id": 10}, {"id": 11}]} if page == 3 else stub(page)
+    )
+
+    ids = list(discover_movie_ids(page_fetcher=stub_with_repeat))
+
+    assert ids == [10, 11, 12]
+
+
+def test_fetch_discovered_overlaps_discovery_and_details():
+    detail_started = threading.Event()
+
+    def page_fetcher(page):
+        if page == 3:
+            # The last page only completes once a detail fetch is already running
+            assert detail_started.wait(timeout=5)
+        return {"total_pages": 3, "results": [{"id": page}]}
+
+    def fetch_fn(movie_id):
+        detail_started.set()
+        return {"id": movie_id}
+
+    movies = fetch_discovered(page_fetcher=page_fetcher, fetch_fn=fetch_fn)
+
+    assert movies == {1: {"id": 1}, 2: {"id": 2}, 3: {"id": 3}}
+
+
+@patch("extract.api.session.get")
+def test_fetch_discover_page_requests_page(mock_get):
+    fake_response = MagicMock()
+    fake_response.json.return_value = {"page": 2, "results": []}
+    mock_get.return_value = fake_response
+
+    payload = fetch_discover_page("movie/popular", 2, {"region": "US"})
+
+    assert payload["page"] == 2
+    _, kwargs = mock_get.call_args
+    assert mock_get.call_args[0][0].endswith("/movie/popular")
+    assert kwargs["params"]["page"] == 2
+    assert kwargs["params"]["region"] == "US"
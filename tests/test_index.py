@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.index import MovieIndex, SortedIndex, range_mask
+from scripts.search import range_filter
+
+
+@pytest.fixture
+def movie_df():
+    """
+    Catalog fixture with gaps (NaN / NaT) in every indexed column.
+    """
+    return pd.DataFrame({
+        "title": ["A", "B", "C", "D", "E", "F"],
+        "runtime": [90, 120, None, 150, 120, 101],
+        "vote_average": [7.5, 8.1, 6.0, None, 7.0, 9.2],
+        "release_date": pd.to_datetime([
+            "2009-12-31", "2010-01-01", "2012-06-15", "2015-12-31", None, "2016-01-01",
+        ]),
+        "budget_musd": [10.0, 55.0, 20.0, 200.0, None, 7.5],
+    })
+
+
+@pytest.fixture
+def random_df():
+    rng = np.random.default_rng(7)
+    n = 5_000
+    df = pd.DataFrame({
+        "runtime": rng.integers(60, 200, n).astype(float),
+        "vote_average": rng.integers(0, 100, n) / 10,
+        "release_date": pd.to_datetime("1990-01-01") + pd.to_timedelta(rng.integers(0, 12_000, n), unit="D"),
+        "budget_musd": rng.gamma(2, 20, n).round(1),
+    })
+    df.loc[rng.random(n) < 0.05, "vote_average"] = np.nan
+    df.loc[rng.random(n) < 0.05, "release_date"] = pd.NaT
+    return df
+
+
+def test_sorted_index_range_excludes_missing(movie_df):
+    index = SortedIndex(movie_df["runtime"])
+
+    assert sorted(index.range(100, 150)) == [1, 3, 4, 5]
+    assert sorted(index.range(100, 150, inclusive="neither")) == [1, 4, 5]
+    assert sorted(index.range(None, None)) == [0, 1, 3, 4, 5]
+
+
+def test_sorted_index_leaves_out_unconvertible_values():
+    runtime = pd.Series([100, "n/a", 90, None], dtype=object)
+    index = MovieIndex(pd.DataFrame({"runtime": runtime}), columns=["runtime"])
+
+    assert index.lookup({"runtime": (100, None, "neither")}).tolist() == []
+    assert sorted(index.lookup({"runtime": (None, None)})) == [0, 2]
+    assert sorted(SortedIndex(runtime).range(90, 100)) == [0, 2]
+
+
+def test_sorted_index_date_bounds(movie_df):
+    index = SortedIndex(movie_df["release_date"])
+
+    assert sorted(index.range("2010-01-01", "2015-12-31")) == [1, 2, 3]
+    assert sorted(index.range("2010-01-01", None, inclusive="neither")) == [2, 3, 5]
+
+
+def test_movie_index_date_bucket_with_rating(movie_df):
+    index = MovieIndex(movie_df)
+
+    result = index.select(movie_df, {
+        "release_date": ("2010-01-01", "2015-12-31"),
+        "vote_average": (7, None, "neither"),
+    })
+
+    assert list(result["title"]) == ["B"]
+
+
+def test_movie_index_rejects_unindexed_column(movie_df):
+    with pytest.raises(KeyError):
+        MovieIndex(movie_df).lookup({"title": ("A", "B")})
+
+
+def test_movie_index_rejects_other_frame(movie_df):
+    index = MovieIndex(movie_df)
+
+    with pytest.raises(ValueError):
+        index.select(movie_df.head(2), {"runtime": (0, None)})
+
+
+@pytest.mark.parametrize("ranges", [
+    {"runtime": (90, 120)},
+    {"vote_average": (7, None, "neither"), "release_date": ("2010-01-01", "2015-12-31")},
+    {"budget_musd": (None, 30), "runtime": (100, 180, "left"), "vote_average": (5, 9)},
+    {"runtime": (500, None)},
+])
+def test_index_lookup_matches_full_scan(random_df, ranges):
+    index = MovieIndex(random_df)
+
+    expected = random_df
+    for column, (low, high, *side) in ranges.items():
+        expected = expected[range_mask(expected[column], low, high, *side)]
+
+    pd.testing.assert_frame_equal(index.select(random_df, ranges), expected)
+
+
+def test_range_filter_with_and_without_index(random_df):
+    ranges = {"release_date": ("2000-01-01", "2004-12-31"), "vote_average": (8, None)}
+
+    scanned = range_filter(random_df, ranges)
+    indexed = range_filter(random_df, ranges, index=MovieIndex(random_df))
+
+    pd.testing.assert_frame_equal(indexed, scanned)
+    assert len(scanned) > 0
+
+
+def test_range_filter_scans_unindexed_columns(movie_df):
+    index = MovieIndex(movie_df, columns=["runtime"])
+
+    result = range_filter(movie_df, {"runtime": (100, None), "budget_musd": (50, None)}, index=index)
+
+    assert list(result["title"]) == ["B", "D"]
@@ -0,0 +1,110 @@
+import json
+import pytest
+from extract.api import FetchFailure, FetchResult
+from extract.jobs import ExtractionJob
+
+HTTP_500 = FetchFailure("http_5xx", "http 500", 500)
+
+
+class FakeFetcher:
+    """
+    Fetch stub that records every call and fails the IDs in `failing`.
+    """
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def __call__(self, movie_id):
+        self.calls.append(movie_id)
+        if movie_id in self.failing:
+            return FetchResult(None, HTTP_500)
+        return FetchResult({"id": movie_id, "title": f"Movie {movie_id}"})
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return tmp_path / "job.jsonl"
+
+
+def test_run_journals_completed_and_failed(journal):
+    fetcher = FakeFetcher(failing={2})
+    job = ExtractionJob(journal, fetch_fn=fetcher)
+
+    movies = job.run([1, 2, 3])
+
+    assert movies[1]["title"] == "Movie 1"
+    assert movies[2] is None
+    assert job.failed == {2: HTTP_500}
+
+    entries = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert {e["id"]: e["status"] for e in entries} == {1: "ok", 2: "failed", 3: "ok"}
+
+
+def test_run_resumes_from_journal(journal):
+    ExtractionJob(journal, fetch_fn=FakeFetcher(failing={2})).run([1, 2, 3])
+
+    fetcher = FakeFetcher()
+    job = ExtractionJob(journal, fetch_fn=fetcher)
+    movies = job.run([1, 2, 3, 4])
+
+    # Only the new ID is fetched, completed and failed ones come from the journal
+    assert fetcher.calls == [4]
+    assert movies[1]["title"] == "Movie 1"
+    assert movies[2] is None
+    assert movies[4]["title"] == "Movie 4"
+
+
+def test_retry_failed_only(journal):
+    ExtractionJob(journal, fetch_fn=FakeFetcher(failing={2, 3})).run([1, 2, 3])
+
+    fetcher = FakeFetcher(failing={3})
+    job = ExtractionJob(journal, fetch_fn=fetcher)
+    movies = job.retry_failed()
+
+    assert sorted(fetcher.calls) == [2, 3]
+    assert movies[2]["title"] == "Movie 2"
+    assert job.failed == {3: HTTP_500}
+    assert ExtractionJob(journal, fetch_fn=fetcher).failed == {3: HTTP_500}
+
+    # The recovered ID stays completed after another restart
+    assert 2 in ExtractionJob(journal, fetch_fn=fetcher).completed
+
+
+def test_torn_journal_line_is_ignored(journal):
+    ExtractionJob(journal, fetch_fn=FakeFetcher()).run([1])
+    with journal.open("a") as fh:
+        fh.write('{"id": 2, "status": "o')
+
+    fetcher = FakeFetcher()
+    job = ExtractionJob(journal, fetch_fn=fetcher)
+    assert list(job.completed) == [1]
+
+    # Resuming appends on a fresh line, so the refetched ID survives another restart
+    job.run([1, 2])
+    assert fetcher.calls == [2]
+    assert all(json.loads(line) for line in journal.read_text().splitlines())
+
+    fetcher = FakeFetcher()
+    reloaded = ExtractionJob(journal, fetch_fn=fetcher)
+    reloaded.run([1, 2])
+    assert sorted(reloaded.completed) == [1, 2]
+    assert fetcher.calls == []
+
+
+def test_progress_reports_throughput(journal):
+    job = ExtractionJob(journal, fetch_fn=FakeFetcher(failing={1}))
+    job.run([1, 2, 3, 3])
+
+    assert job.progress["done"] == 3
+    assert job.progress["total"] == 3
+    assert job.progress["succeeded"] == 2
+    assert job.progress["failed"] == 1
+    assert job.progress["movies_per_sec"] > 0
+
+
+def test_unclassified_journal_reason_is_loaded(journal):
+    journal.write_text(json.dumps({"id": 5, "status": "failed", "reason": "http 503"}) + "\n")
+
+    job = ExtractionJob(journal, fetch_fn=FakeFetcher())
+
+    assert job.failed == {5: FetchFailure("unknown", "http 503")}
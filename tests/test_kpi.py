@@ -16,6 +16,7 @@ from scripts.kpi import (
     most_successful_franchises,
     most_successful_directors
 )
+from transform.cleaner import MovieDataCleaner
 
 # Fixtures
 
@@ -127,3 +128,33 @@ def test_most_successful_franchises(movie_df):
 def test_most_successful_directors(movie_df):
     result = most_successful_directors(movie_df)
     assert result.index[0] == "Dir2"
+
+
+# Derived metrics from the cleaner
+@pytest.mark.parametrize("kpi", [highest_profit, lowest_profit, highest_roi, lowest_roi])
+def test_kpis_match_with_derived_metrics(movie_df, kpi):
+    derived = MovieDataCleaner(movie_df).add_derived_metrics().df
+
+    expected = kpi(movie_df, top_n=3)
+    result = kpi(derived, top_n=3)
+
+    assert list(result["title"]) == list(expected["title"])
+
+
+def test_franchise_vs_standalone_with_derived_metrics(movie_df):
+    derived = MovieDataCleaner(movie_df).add_derived_metrics().df
+
+    pd.testing.assert_frame_equal(franchise_vs_standalone(derived), franchise_vs_standalone(movie_df))
+
+
+def test_precomputed_roi_is_reused(movie_df):
+    df = movie_df.assign(roi=[1.0, 2.0, 9.0, 1.0, 3.0])
+
+    # C has the lowest revenue/budget ratio but the highest precomputed roi
+    assert highest_roi(df, top_n=1).iloc[0]["title"] == "C"
+
+
+def test_profit_ranking_does_not_modify_input(movie_df):
+    highest_profit(movie_df)
+
+    assert "profit" not in movie_df.columns
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from scripts.kpi import franchise_vs_standalone, most_successful_directors, most_successful_franchises
+from scripts.parallel import hash_partitions, partitioned_agg
+
+
+@pytest.fixture
+def large_movie_df():
+    """
+    Randomised catalog with many directors and collections, and gaps in every column
+    """
+    rng = np.random.default_rng(42)
+    n = 20_000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "revenue_musd": rng.gamma(2, 50, n).round(2),
+        "budget_musd": rng.gamma(2, 20, n).round(2),
+        "popularity": rng.random(n) * 100,
+        "vote_average": rng.integers(0, 100, n) / 10,
+        "belongs_to_collection": [f"Collection {i}" for i in rng.integers(0, 800, n)],
+        "director": [f"Director {i}" for i in rng.integers(0, 3_000, n)],
+    })
+    for column in ["revenue_musd", "budget_musd", "vote_average"]:
+        df.loc[rng.random(n) < 0.05, column] = np.nan
+    df.loc[rng.random(n) < 0.6, "belongs_to_collection"] = None
+    df.loc[rng.random(n) < 0.02, "director"] = None
+    return df
+
+
+def test_hash_partitions_keep_groups_whole(large_movie_df):
+    partitions, uniques = hash_partitions(large_movie_df, "director", 4)
+
+    seen = [set(uniques.take(part["__group_code__"])) for part in partitions]
+    assert len(partitions) == 4
+    assert sum(len(part) for part in partitions) == large_movie_df["director"].notna().sum()
+    assert sum(len(s) for s in seen) == len(set().union(*seen))
+
+
+def test_partitioned_agg_matches_groupby(large_movie_df):
+    aggs = {"total": ("revenue_musd", "sum"), "median": ("budget_musd", "median"), "n": ("id", "count")}
+
+    expected = large_movie_df.groupby("director").agg(**aggs)
+    result = partitioned_agg(large_movie_df, "director", aggs, n_workers=3)
+
+    assert_frame_equal(result, expected, check_exact=True)
+
+
+@pytest.mark.parametrize("kpi", [franchise_vs_standalone, most_successful_franchises, most_successful_directors])
+def test_parallel_kpis_exactly_equal_serial(large_movie_df, kpi):
+    assert_frame_equal(kpi(large_movie_df, n_workers=4), kpi(large_movie_df), check_exact=True)
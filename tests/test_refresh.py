@@ -0,0 +1,207 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from scripts.index import MovieIndex
+from scripts.kpi import highest_revenue
+from scripts.refresh import DatasetRefresher, movie_pipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_frame(n_movies):
+    return pd.DataFrame({
+        "id": range(n_movies),
+        "title": [f"Movie {i}" for i in range(n_movies)],
+        "cast": ["Bruce Willis"] * n_movies,
+        "director": ["Someone"] * n_movies,
+        "runtime": [100 + i for i in range(n_movies)],
+        "revenue_musd": [float(i) for i in range(n_movies)],
+    })
+
+
+def test_refresh_swaps_in_new_generation():
+    sizes = iter([2, 3])
+    refresher = DatasetRefresher(lambda: make_frame(next(sizes)))
+
+    with pytest.raises(RuntimeError):
+        refresher.current()
+
+    assert refresher.refresh()
+    first = refresher.current()
+    assert refresher.refresh()
+    second = refresher.current()
+
+    assert (first.version, len(first.df)) == (1, 2)
+    assert (second.version, len(second.df)) == (2, 3)
+    assert isinstance(second.index, MovieIndex)
+    assert second.text_index.search("bruce willis")[0].rows.tolist() == [0, 1, 2]
+    assert refresher.metrics()["swap_count"] == 2
+
+
+def test_failed_refresh_keeps_current_generation():
+    calls = iter([make_frame(2), RuntimeError("TMDB down")])
+
+    def build():
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    refresher = DatasetRefresher(build, index_fn=None)
+    refresher.refresh()
+
+    assert not refresher.refresh()
+    metrics = refresher.metrics()
+    assert refresher.current().version == 1
+    assert metrics["failure_count"] == 1
+    assert metrics["swap_count"] == 1
+    assert metrics["last_error"] == "RuntimeError: TMDB down"
+
+
+def test_readers_are_not_blocked_during_refresh():
+    release = threading.Event()
+    building = threading.Event()
+    frames = iter([make_frame(2), make_frame(5)])
+
+    def build():
+        frame = next(frames)
+        if len(frame) == 5:
+            building.set()
+            release.wait(timeout=5)
+        return frame
+
+    refresher = DatasetRefresher(build, index_fn=None)
+    refresher.refresh()
+
+    worker = threading.Thread(target=refresher.refresh)
+    worker.start()
+    building.wait(timeout=5)
+
+    # While the new generation is being built readers get the old one immediately
+    assert refresher.metrics()["refreshing"]
+    assert len(highest_revenue(refresher.current().df)) == 2
+    # A second refresh does not pile up behind the running one
+    assert not refresher.refresh()
+
+    release.set()
+    worker.join()
+    assert len(refresher.current().df) == 5
+
+
+def test_staleness_and_duration_metrics():
+    clock = FakeClock()
+    refresher = DatasetRefresher(lambda: make_frame(1), index_fn=None, clock=clock)
+
+    assert refresher.metrics()["staleness"] is None
+
+    refresher.refresh()
+    clock.now += 30
+
+    metrics = refresher.metrics()
+    assert metrics["staleness"] == 30
+    assert metrics["last_refresh_duration"] >= 0
+    assert metrics["version"] == 1
+
+
+def test_background_loop_refreshes_periodically():
+    refresher = DatasetRefresher(lambda: make_frame(1), interval=0.01, index_fn=None).start()
+    try:
+        deadline = time.monotonic() + 5
+        while refresher.metrics()["swap_count"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop(timeout=5)
+
+    assert refresher.metrics()["swap_count"] >= 3
+
+
+def test_movie_pipeline_extracts_and_cleans():
+    payloads = {
+        1: {"id": 1, "title": "A", "budget": 10_000_000, "revenue": 30_000_000, "belongs_to_collection": None},
+        2: None,
+        3: {"id": 3, "title": "B", "budget": 20_000_000, "revenue": 10_000_000, "belongs_to_collection": None},
+    }
+    requested = []
+
+    def fetch_fn(ids):
+        requested.extend(ids)
+        return {mid: payloads[mid] for mid in ids}
+
+    build = movie_pipeline(
+        lambda: [1, 2, 3],
+        clean=lambda cleaner: cleaner.convert_to_millions(["budget", "revenue"]),
+        fetch_fn=fetch_fn,
+    )
+    df = build()
+
+    assert requested == [1, 2, 3]
+    assert df.index.tolist() == [0, 1]
+    assert df["roi"].tolist() == [3.0, 0.5]
+
+
+def test_restart_refused_while_stopped_loop_is_still_refreshing():
+    release = threading.Event()
+    building = threading.Event()
+
+    def build():
+        building.set()
+        release.wait(timeout=5)
+        return make_frame(1)
+
+    refresher = DatasetRefresher(build, interval=0.01, index_fn=None).start()
+    building.wait(timeout=5)
+    refresher.stop(timeout=0.01)
+
+    # The old loop has not exited yet, a second one must not start next to it
+    with pytest.raises(RuntimeError):
+        refresher.start()
+
+    release.set()
+    refresher.stop(timeout=5)
+    assert refresher._thread is None
+
+    # Once the old loop is gone the refresher can be started again
+    refresher.start()
+    refresher.stop(timeout=5)
+    assert refresher._thread is None
+
+
+def tmdb_payload(movie_id, title, budget, revenue, collection=None):
+    return {
+        "id": movie_id, "title": title, "adult": False, "status": "Released",
+        "budget": budget, "revenue": revenue, "runtime": 110, "popularity": 12.5,
+        "vote_count": 900, "vote_average": 7.4, "release_date": "2012-09-28",
+        "overview": "A movie.", "tagline": "",
+        "belongs_to_collection": {"id": 1, "name": collection} if collection else None,
+        "genres": [{"id": 28, "name": "Action"}, {"id": 878, "name": "Science Fiction"}],
+        "cast": ["Bruce Willis", "Emily Blunt"], "cast_size": 2,
+        "director": "Rian Johnson", "crew_size": 40,
+    }
+
+
+def test_movie_pipeline_cleans_raw_payloads_by_default():
+    payloads = {
+        1: tmdb_payload(1, "Looper", 30_000_000, 176_500_000),
+        2: tmdb_payload(2, "Sequel", 50_000_000, 100_000_000, collection="Looper Collection"),
+        3: tmdb_payload(3, "Rumored", 0, 0) | {"status": "Rumored"},
+    }
+    refresher = DatasetRefresher(movie_pipeline([1, 2, 3], fetch_fn=lambda ids: payloads))
+    refresher.refresh()
+    dataset = refresher.current()
+    df = dataset.df
+
+    assert df["title"].tolist() == ["Looper", "Sequel"]
+    assert df["budget_musd"].tolist() == [30.0, 50.0]
+    assert df["cast"].tolist() == ["Bruce Willis|Emily Blunt"] * 2
+    assert df["genres"].iloc[0] == "Action|Science Fiction"
+    assert df["belongs_to_collection"].tolist() == [None, "Looper Collection"]
+    assert pd.api.types.is_datetime64_any_dtype(df["release_date"])
+    assert dataset.index.lookup({"budget_musd": (40, None)}).tolist() == [1]
+    assert highest_revenue(df)["title"].iloc[0] == "Looper"
@@ -0,0 +1,168 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from extract import api
+from settings.config import get_settings
+from settings.utils import CircuitBreaker, RetryBudget, get_retry_session
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    """
+    Answers /<fault>/... with the fault named by the first path segment:
+    ok, 404, 429, 503, garbage (invalid JSON), drop (closes without answering)
+    and hang (answers after half a second).
+    """
+
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        fault = self.path.strip("/").split("/")[0]
+
+        if fault == "drop":
+            self.close_connection = True
+            return
+        if fault == "hang":
+            time.sleep(0.5)
+            fault = "ok"
+
+        status = int(fault) if fault.isdigit() else 200
+        body = b"{not json" if fault == "garbage" else b'{"title": "Stub Movie", "credits": {}}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on the drop and hang faults on purpose
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer(("127.0.0.1", 0), FaultHandler)
+    server.hits = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_api(stub_server, monkeypatch):
+    """Points extract.api at the stub with its own session, budget and breaker."""
+    def point_at(fault, retries=0, budget=None, breaker=None):
+        monkeypatch.setenv("TMDB_API_URL", f"http://127.0.0.1:{stub_server.server_port}/{fault}")
+        get_settings.cache_clear()
+        monkeypatch.setattr(api, "_session", get_retry_session(retries=retries, backoff_factor=0, budget=budget))
+        monkeypatch.setattr(api, "_breaker", breaker or CircuitBreaker())
+        monkeypatch.setattr(api, "REQUEST_TIMEOUT", 0.2)
+        return stub_server
+
+    return point_at
+
+
+def base_url(server, fault):
+    return f"http://127.0.0.1:{server.server_port}/{fault}/movie/1"
+
+
+def test_session_without_budget_retries_every_request(stub_server):
+    session = get_retry_session(retries=3, backoff_factor=0)
+
+    for _ in range(10):
+        assert session.get(base_url(stub_server, "503")).status_code == 503
+
+    assert len(stub_server.hits) == 10 * 4
+
+
+def test_retry_budget_bounds_retries_across_requests(stub_server):
+    budget = RetryBudget(ratio=0.1, reserve=2)
+    session = get_retry_session(retries=3, backoff_factor=0, budget=budget)
+
+    for _ in range(10):
+        # Once the budget is spent the 503 comes back without retrying
+        assert session.get(base_url(stub_server, "503")).status_code == 503
+
+    # The first request spends the reserve, the nine deposits after it do not add up to another retry
+    assert len(stub_server.hits) == 10 + 2
+    assert budget.stats["retries"] == 2
+    assert budget.stats["retries_denied"] == 10
+
+
+def test_exhausted_budget_is_classified(stub_api):
+    budget = RetryBudget(ratio=0.1, reserve=0)
+    stub_api("drop", retries=3, budget=budget)
+
+    assert api._request_movie(1).error.kind == "retry_budget_exhausted"
+
+
+@pytest.mark.parametrize("fault, status", [("503", 503), ("429", 429)])
+def test_refused_status_retry_is_classified_as_budget_exhausted(stub_api, fault, status):
+    budget = RetryBudget(ratio=0.1, reserve=0)
+    server = stub_api(fault, retries=3, budget=budget)
+
+    failure = api._request_movie(1).error
+
+    assert (failure.kind, failure.status) == ("retry_budget_exhausted", status)
+    assert len(server.hits) == 1
+
+
+def test_exhausted_retry_count_keeps_status_kind(stub_api):
+    # Out of retries, not out of budget: still a plain 5xx
+    stub_api("503", retries=1, budget=RetryBudget(ratio=0.1, reserve=10))
+
+    assert api._request_movie(1).error.kind == "http_5xx"
+
+
+@pytest.mark.parametrize("fault, kind, status", [
+    ("404", "not_found", 404),
+    ("429", "rate_limited", 429),
+    ("503", "http_5xx", 503),
+    ("garbage", "decode", None),
+    ("drop", "network", None),
+    ("hang", "timeout", None),
+])
+def test_failures_are_classified(stub_api, fault, kind, status):
+    stub_api(fault)
+
+    result = api._request_movie(1)
+
+    assert result.data is None
+    assert result.error.kind == kind
+    assert result.error.status == status
+
+
+def test_successful_fetch_from_stub(stub_api):
+    stub_api("ok")
+
+    assert api.fetch_single_movie(1)["title"] == "Stub Movie"
+
+
+def test_circuit_breaker_fails_fast_when_tmdb_degrades(stub_api):
+    breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=5, cooldown=60)
+    server = stub_api("503", breaker=breaker)
+
+    results = [api._request_movie(movie_id) for movie_id in range(20)]
+
+    # Only the calls needed to trip the breaker reach the server
+    assert len(server.hits) == 5
+    assert [r.error.kind for r in results[5:]] == ["circuit_open"] * 15
+    assert breaker.stats == {"rejected": 15, "opened": 1}
+
+
+def test_client_errors_do_not_trip_the_breaker(stub_api):
+    breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=5, cooldown=60)
+    stub_api("404", breaker=breaker)
+
+    for movie_id in range(20):
+        assert api._request_movie(movie_id).error.kind == "not_found"
+
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -1,7 +1,9 @@
 import pytest
 import pandas as pd
+from scripts.index import MovieIndex
 from scripts.search import (
     apply_filter,
+    search_batch,
     search_sci_fi,
     search_uma_by_tarantino,
 )
@@ -133,3 +135,102 @@ def test_search_uma_by_tarantino_case_insensitive(movie_df):
     result = search_uma_by_tarantino(df)
 
     assert "Pulp Fiction" in set(result["title"])
+
+
+# search_batch
+def test_search_batch_matches_independent_filters(movie_df):
+    queries = [
+        {"genres": ["Science Fiction", "Action"], "cast": "bruce willis"},
+        {"cast": "Uma Thurman", "director": "Quentin Tarantino", "sort_by": "runtime"},
+        {"genres": "Action", "vote_average": (8, None)},
+        {"runtime": (100, 120, "neither")},
+        {"cast": "Nonexistent Actor"},
+    ]
+
+    results = search_batch(movie_df, queries)
+
+    assert list(results[0]["title"]) == list(search_sci_fi(movie_df).sort_index()["title"])
+    assert list(results[1]["title"]) == list(search_uma_by_tarantino(movie_df)["title"])
+    assert list(results[2]["title"]) == ["Kill Bill"]
+    assert list(results[3]["title"]) == ["Looper", "Kill Bill"]
+    assert results[4].empty
+
+
+def test_search_batch_handles_missing_values(movie_df):
+    df = movie_df.copy()
+    df.loc[0, "genres"] = None
+
+    result, = search_batch(df, [{"genres": "science fiction"}])
+
+    assert list(result["title"]) == ["Fifth Element"]
+
+
+def test_search_batch_needle_across_names(movie_df):
+    # A needle spanning the "|" separator is matched against the whole value
+    across, within = search_batch(movie_df, [{"cast": "willis|emily"}, {"cast": "lis"}])
+
+    assert list(across["title"]) == ["Looper"]
+    assert list(within["title"]) == ["Looper", "Fifth Element"]
+
+
+def test_search_batch_on_categorical_columns(movie_df):
+    df = movie_df.astype({"genres": "category", "cast": "category"})
+
+    result, = search_batch(df, [{"genres": "Action", "cast": "Willis"}])
+
+    assert list(result["title"]) == ["Looper"]
+
+
+def test_search_batch_uses_index(movie_df):
+    queries = [{"runtime": (110, 130)}, {"runtime": (110, 130), "genres": "Action"}]
+
+    scanned = search_batch(movie_df, queries)
+    indexed = search_batch(movie_df, queries, index=MovieIndex(movie_df))
+
+    for left, right in zip(scanned, indexed):
+        pd.testing.assert_frame_equal(left, right)
+
+
+def test_search_batch_rejects_index_of_other_frame(movie_df):
+    with pytest.raises(ValueError):
+        search_batch(movie_df, [{"runtime": (0, None)}], index=MovieIndex(movie_df.head(2)))
+
+
+def test_search_batch_accepts_json_ranges(movie_df):
+    # Ranges decoded from JSON arrive as lists
+    as_lists = search_batch(movie_df, [{"vote_average": [7, None]}, {"runtime": [110, 126, "left"]}])
+    as_tuples = search_batch(movie_df, [{"vote_average": (7, None)}, {"runtime": (110, 126, "left")}])
+
+    for left, right in zip(as_lists, as_tuples):
+        pd.testing.assert_frame_equal(left, right)
+    assert len(as_lists[0]) > 0
+
+
+def test_search_batch_rejects_invalid_predicate(movie_df):
+    with pytest.raises(ValueError, match="'vote_average'"):
+        search_batch(movie_df, [{"vote_average": 7}])
+    with pytest.raises(ValueError, match="'cast'"):
+        search_batch(movie_df, [{"cast": ["Bruce Willis", 3, 4, 5]}])
+
+
+def test_search_batch_accepts_json_date_ranges(movie_df):
+    dates = pd.to_datetime(["2012-09-28", "1997-05-07", "1994-09-10", "2003-10-10"])
+    df = movie_df.head(len(dates)).assign(release_date=dates)
+
+    query = {"release_date": ["2000-01-01", "2015-12-31"]}
+    as_json, = search_batch(df, [query])
+    indexed, = search_batch(df, [query], index=MovieIndex(df))
+    expected, = search_batch(df, [{"release_date": (pd.Timestamp("2000-01-01"), pd.Timestamp("2015-12-31"))}])
+
+    pd.testing.assert_frame_equal(as_json, expected)
+    pd.testing.assert_frame_equal(indexed, expected)
+    assert list(as_json["release_date"].dt.year) == [2012, 2003]
+
+
+def test_search_batch_text_column_list_stays_needles(movie_df):
+    result, = search_batch(movie_df, [{"genres": ["Action", "Science Fiction"]}])
+
+    assert len(result) > 0
+    assert result["genres"].str.contains("Science Fiction").all()
+    with pytest.raises(ValueError, match="'runtime'"):
+        search_batch(movie_df, [{"runtime": "long"}])
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.kpi import (
+    approx_distinct,
+    approx_franchise_vs_standalone,
+    approx_top_directors,
+    approx_top_franchises,
+    franchise_vs_standalone,
+)
+from scripts.sketches import FrequentItems, HyperLogLog, KLLSketch
+
+
+def rank_error(sorted_data, sketch):
+    """Largest normalised rank error of the sketch quantiles over a grid of q."""
+    return max(
+        abs(np.searchsorted(sorted_data, sketch.quantile(q), side="right") / len(sorted_data) - q)
+        for q in np.linspace(0.01, 0.99, 99)
+    )
+
+
+@pytest.fixture
+def movie_chunks():
+    """
+    A synthetic catalog streamed as 10 chunks, with a few prolific directors
+    """
+    rng = np.random.default_rng(3)
+    n = 50_000
+    directors = np.where(
+        rng.random(n) < 0.2,
+        rng.choice(["Spielberg", "Scott", "Nolan"], n, p=[0.5, 0.3, 0.2]),
+        pd.Series(rng.integers(0, 20_000, n)).map("Director {}".format),
+    )
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "revenue_musd": rng.gamma(2, 50, n),
+        "budget_musd": rng.gamma(2, 20, n),
+        "popularity": rng.random(n) * 100,
+        "vote_average": rng.integers(0, 100, n) / 10,
+        "belongs_to_collection": pd.Series(rng.integers(0, 500, n)).map("Collection {}".format)
+                                   .where(rng.random(n) < 0.3),
+        "director": directors,
+    })
+    return [df.iloc[start:start + 5_000] for start in range(0, n, 5_000)]
+
+
+# KLL
+@pytest.mark.parametrize("seed", range(5))
+def test_kll_rank_error_within_bound(seed):
+    rng = np.random.default_rng(seed)
+    data = rng.lognormal(0, 1, 100_000)
+
+    sketch = KLLSketch(k=200, seed=seed).update(data)
+
+    assert rank_error(np.sort(data), sketch) < 0.02
+    assert sum(len(level) for level in sketch.levels) < 3 * 200
+
+
+def test_kll_merged_chunks_within_bound():
+    data = np.random.default_rng(11).normal(size=100_000)
+    chunks = np.array_split(data, 25)
+
+    sketch = KLLSketch(seed=0)
+    for i, chunk in enumerate(chunks):
+        sketch.merge(KLLSketch(seed=i + 1).update(chunk))
+
+    assert sketch.n == len(data)
+    assert rank_error(np.sort(data), sketch) < 0.02
+
+
+def test_kll_small_input_is_exact():
+    sketch = KLLSketch().update([5, 1, 3, np.nan])
+
+    assert sketch.n == 3
+    assert sketch.quantile(0.5) == 3
+    assert sketch.rank(3) == pytest.approx(2 / 3)
+    assert np.isnan(KLLSketch().quantile(0.5))
+
+
+# Frequent items
+def test_frequent_items_error_bounds():
+    rng = np.random.default_rng(5)
+    values = rng.zipf(1.5, 200_000) % 50_000
+    true_counts = pd.Series(values).value_counts()
+
+    sketch = FrequentItems(capacity=200)
+    for chunk in np.array_split(values, 20):
+        sketch.merge(FrequentItems(capacity=200).update(chunk))
+
+    assert sketch.max_error <= len(values) / 201
+    estimated = sketch.counts
+    assert (estimated <= true_counts[estimated.index]).all()
+    assert (estimated + sketch.max_error >= true_counts[estimated.index]).all()
+    # Every item above the error bound is retained
+    heavy = true_counts[true_counts > sketch.max_error].index
+    assert set(heavy) <= set(estimated.index)
+
+
+def test_frequent_items_exact_below_capacity():
+    sketch = FrequentItems(capacity=10).update(["a", "b", "a", None, "c", "a"])
+
+    top = sketch.top(2)
+    assert list(top.index) == ["a", "b"]
+    assert top.loc["a", "count"] == 3
+    assert sketch.max_error == 0
+
+
+def test_frequent_items_ignores_unused_categories():
+    values = pd.Categorical(["a", "a", "b"], categories=["a", "b", "c", "d"])
+
+    sketch = FrequentItems(capacity=2).update(values)
+
+    assert sketch.counts.to_dict() == {"a": 2, "b": 1}
+    assert sketch.max_error == 0
+
+
+# HyperLogLog
+@pytest.mark.parametrize("n", [10, 1_000, 50_000, 500_000])
+def test_hyperloglog_relative_error(n):
+    # Three standard errors at precision 12
+    assert HyperLogLog().update(np.arange(n)).count() == pytest.approx(n, rel=0.05)
+
+
+def test_hyperloglog_merge_is_union():
+    left = HyperLogLog().update(np.arange(0, 60_000))
+    right = HyperLogLog().update(np.arange(40_000, 100_000))
+
+    assert left.merge(right).count() == HyperLogLog().update(np.arange(100_000)).count()
+
+
+def test_hyperloglog_merge_requires_same_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+# Approximate KPIs
+def test_approx_franchise_vs_standalone(movie_chunks):
+    exact = franchise_vs_standalone(pd.concat(movie_chunks))
+    approx = approx_franchise_vs_standalone(iter(movie_chunks), seed=7)
+
+    means = ["mean_revenue", "mean_budget", "mean_popularity", "mean_rating"]
+    pd.testing.assert_frame_equal(approx[means], exact[means], rtol=1e-9)
+
+    for group in ["Standalone", "Franchise"]:
+        roi = pd.concat(movie_chunks)
+        roi = (roi["revenue_musd"] / roi["budget_musd"])[roi["belongs_to_collection"].notna() == (group == "Franchise")]
+        rank = (roi <= approx.loc[group, "median_roi"]).mean()
+        assert rank == pytest.approx(0.5, abs=0.02)
+
+
+def test_approx_franchise_vs_standalone_is_deterministic(movie_chunks):
+    first = approx_franchise_vs_standalone(iter(movie_chunks), seed=3)
+    second = approx_franchise_vs_standalone(iter(movie_chunks), seed=3)
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_approx_top_directors(movie_chunks):
+    exact = pd.concat(movie_chunks)["director"].value_counts()
+
+    top = approx_top_directors(iter(movie_chunks), top_n=3, capacity=100)
+
+    assert list(top.index) == ["Spielberg", "Scott", "Nolan"]
+    for director, row in top.iterrows():
+        assert row["movie_count"] <= exact[director] <= row["movie_count"] + row["max_error"]
+
+
+def test_approx_top_franchises_single_frame(movie_chunks):
+    df = pd.concat(movie_chunks)
+
+    top = approx_top_franchises(df, top_n=5, capacity=1_000)
+
+    # Below capacity the counts are exact
+    exact = df["belongs_to_collection"].value_counts()
+    assert top["movie_count"].tolist() == exact.head(5).tolist()
+    assert top.index.name == "belongs_to_collection"
+
+
+def test_approx_distinct(movie_chunks):
+    exact = pd.concat(movie_chunks)["director"].nunique()
+
+    assert approx_distinct(iter(movie_chunks), "director") == pytest.approx(exact, rel=0.05)
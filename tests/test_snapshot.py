@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from scripts.index import MovieIndex
+from scripts.kpi import (
+    franchise_vs_standalone,
+    highest_roi,
+    most_successful_directors,
+    most_successful_franchises,
+)
+from scripts.search import fuzzy_search, range_filter, search_sci_fi, search_uma_by_tarantino
+from transform.cleaner import MovieDataCleaner
+from transform.snapshot import open_snapshot, write_snapshot
+
+
+@pytest.fixture
+def movie_df():
+    """
+    A cleaned-looking movie frame with text, numeric, nullable, date and boolean columns
+    """
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "title": ["Looper", "Fifth Element", "Pulp Fiction", "Kill Bill", "Amélie"],
+        "genres": [
+            "Science Fiction|Action", "Science Fiction|Action", "Crime|Drama",
+            "Action|Thriller", None,
+        ],
+        "cast": [
+            "Bruce Willis|Emily Blunt", "Bruce Willis", "John Travolta|Uma Thurman",
+            "Uma Thurman", "Audrey Tautou",
+        ],
+        "director": ["Rian Johnson", "Luc Besson", "Quentin Tarantino", "Quentin Tarantino", None],
+        "belongs_to_collection": [None, None, None, "Kill Bill Collection", None],
+        "release_date": pd.to_datetime(["2012-09-28", "1997-05-07", "1994-09-10", "2003-10-10", None]),
+        "budget_musd": [30.0, 90.0, 8.0, 30.0, 10.0],
+        "revenue_musd": [176.5, 263.9, 213.9, 180.9, 174.0],
+        "vote_count": pd.Series([9000, 10000, 27000, None, 5], dtype=object),
+        "vote_average": [6.9, 7.5, 8.5, 8.0, 7.9],
+        "popularity": [20.1, 30.5, 60.0, 40.2, 15.0],
+        "runtime": [119, 126, 154, 111, 122],
+        "is_franchise": [False, False, False, True, False],
+    })
+
+
+@pytest.fixture
+def snapshot(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    MovieDataCleaner(movie_df).to_snapshot(path)
+    return open_snapshot(path)
+
+
+def is_memory_mapped(array) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_round_trip_values(movie_df, snapshot):
+    assert list(snapshot.columns) == list(movie_df.columns)
+    assert snapshot["title"].tolist() == movie_df["title"].tolist()
+    assert snapshot["director"].isna().tolist() == movie_df["director"].isna().tolist()
+    assert snapshot["release_date"].equals(movie_df["release_date"])
+    assert snapshot["runtime"].dtype == "int64"
+    assert snapshot["is_franchise"].dtype == bool
+    # Nullable object numbers come back as float64
+    assert snapshot["vote_count"].dtype == "float64"
+    assert np.isnan(snapshot["vote_count"].iloc[3])
+
+
+def test_columns_stay_memory_mapped(snapshot):
+    for column in ["runtime", "budget_musd", "release_date", "is_franchise"]:
+        assert is_memory_mapped(snapshot[column].to_numpy())
+    assert is_memory_mapped(snapshot["director"].array.codes)
+
+
+def test_snapshot_is_read_only(snapshot):
+    with pytest.raises(ValueError):
+        snapshot["runtime"].to_numpy()[0] = 1
+
+
+def test_rewrite_replaces_snapshot(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    write_snapshot(movie_df, path)
+    write_snapshot(movie_df.head(2), path, retain_seconds=0)
+
+    assert len(open_snapshot(path)) == 2
+    # Only the link and the live generation are left
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["movies", os.readlink(path)])
+
+
+def test_rewrite_keeps_recent_generations_for_readers(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    write_snapshot(movie_df, path)
+    first = path.resolve()
+    write_snapshot(movie_df.head(2), path)
+
+    assert first.exists()
+    assert len(open_snapshot(first)) == 5
+
+
+def test_retention_counts_from_replacement_not_write_time(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    write_snapshot(movie_df, path)
+    first = path.resolve()
+    # Written an hour ago, but live until the next write
+    an_hour_ago = time.time() - 3600
+    os.utime(first, (an_hour_ago, an_hour_ago))
+
+    write_snapshot(movie_df.head(2), path)
+    assert first.exists()
+
+    write_snapshot(movie_df.head(3), path, retain_seconds=0)
+    assert not first.exists()
+    assert len(open_snapshot(path)) == 3
+
+
+def test_snapshot_written_as_plain_directory_is_replaced(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    path.mkdir()
+    (path / "_meta.json").write_text("{}")
+
+    write_snapshot(movie_df, path)
+
+    assert path.is_symlink()
+    assert len(open_snapshot(path)) == 5
+
+
+def test_readers_never_see_a_missing_snapshot(movie_df, tmp_path):
+    path = tmp_path / "movies"
+    write_snapshot(movie_df, path)
+    stop = threading.Event()
+    errors, opened = [], []
+
+    def read():
+        while not stop.is_set():
+            try:
+                opened.append(len(open_snapshot(path)))
+            except Exception as exc:
+                errors.append(exc)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(200):
+            write_snapshot(movie_df.head(1 + i % 5), path)
+    finally:
+        stop.set()
+        reader.join()
+
+    assert errors == []
+    assert opened and set(opened) <= {1, 2, 3, 4, 5}
+
+
+def test_empty_snapshot(movie_df, tmp_path):
+    write_snapshot(movie_df.head(0), tmp_path / "empty")
+
+    assert open_snapshot(tmp_path / "empty").empty
+
+
+def test_unsupported_column_is_rejected(tmp_path):
+    with pytest.raises(TypeError):
+        write_snapshot(pd.DataFrame({"cast": [["a", "b"]]}), tmp_path / "bad")
+
+
+@pytest.mark.parametrize("kpi", [
+    franchise_vs_standalone, most_successful_franchises, most_successful_directors,
+])
+def test_group_kpis_on_snapshot(movie_df, snapshot, kpi):
+    expected = kpi(movie_df)
+    result = kpi(snapshot)
+
+    # Groups keyed on a text column come back with a CategoricalIndex
+    result.index = result.index.astype(expected.index.dtype)
+    assert_frame_equal(result, expected)
+
+
+def test_parallel_kpi_on_snapshot(movie_df, snapshot):
+    expected = most_successful_directors(movie_df)
+    result = most_successful_directors(snapshot, n_workers=2)
+
+    result.index = result.index.astype(object)
+    assert_frame_equal(result, expected)
+
+
+def test_rankings_on_snapshot(movie_df, snapshot):
+    assert highest_roi(snapshot)["title"].tolist() == highest_roi(movie_df)["title"].tolist()
+
+
+@pytest.mark.parametrize("search", [search_sci_fi, search_uma_by_tarantino])
+def test_searches_on_snapshot(movie_df, snapshot, search):
+    assert search(snapshot)["title"].tolist() == search(movie_df)["title"].tolist()
+
+
+def test_indexed_and_fuzzy_search_on_snapshot(snapshot):
+    ranges = {"release_date": ("1995-01-01", "2010-12-31"), "vote_average": (7.5, None)}
+
+    assert range_filter(snapshot, ranges, index=MovieIndex(snapshot))["title"].tolist() == [
+        "Fifth Element", "Kill Bill",
+    ]
+    assert fuzzy_search(snapshot, "tarantino")["title"].tolist() == ["Pulp Fiction", "Kill Bill"]
+
+
+def _count_franchises(path):
+    return int(open_snapshot(path)["belongs_to_collection"].notna().sum())
+
+
+def test_snapshot_opened_from_other_processes(movie_df, tmp_path):
+    write_snapshot(movie_df, tmp_path / "movies")
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        counts = list(executor.map(_count_franchises, [tmp_path / "movies"] * 2))
+
+    assert counts == [1, 1]
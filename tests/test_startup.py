@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time allowed for each entry point, in microseconds.
+# Loading pandas or requests alone costs well over this.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = {"pandas", "numpy", "requests", "pydantic", "pydantic_settings", "dotenv"}
+
+
+def import_profile(module: str) -> dict:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`
+    and returns a mapping of imported module name -> cumulative microseconds.
+    TMDB settings are removed from the environment to prove they are not read.
+    """
+    env = {k: v for k, v in os.environ.items() if not k.startswith("TMDB_")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("module", [
+    "extract.api",
+    "extract.jobs",
+    "extract.discover",
+    "scripts.kpi",
+    "scripts.search",
+])
+def test_entry_point_import_is_cheap(module):
+    profile = import_profile(module)
+
+    assert not HEAVY_MODULES & set(profile), f"{module} eagerly imports a heavy dependency"
+    assert profile[module] < IMPORT_BUDGET_US
+
+
+def test_session_and_settings_are_built_on_first_use(monkeypatch):
+    from extract import api
+    from settings import config
+
+    monkeypatch.setattr(api, "_session", None)
+    assert api.get_session() is api.get_session()
+    assert api.session is api.get_session()
+    assert api.BASE_URL == config.get_settings().TMDB_API_URL
@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+from scripts.search import fuzzy_search
+from scripts.text_index import TrigramIndex, edit_distance, normalize, similarity, trigrams
+
+
+@pytest.fixture
+def movie_df():
+    """
+    Dataset fixture with pipe-joined cast lists, as produced by the cleaner
+    """
+    return pd.DataFrame({
+        "title": ["Pulp Fiction", "Kill Bill: Vol. 1", "Looper", "Amélie", "Die Hard"],
+        "cast": [
+            "John Travolta|Uma Thurman|Bruce Willis",
+            "Uma Thurman|Lucy Liu",
+            "Bruce Willis|Emily Blunt",
+            "Audrey Tautou",
+            "Bruce Willis|Alan Rickman",
+        ],
+        "director": [
+            "Quentin Tarantino",
+            "Quentin Tarantino",
+            "Rian Johnson",
+            "Jean-Pierre Jeunet",
+            None,
+        ],
+        "vote_average": [8.5, 8.0, 7.4, 7.9, 7.8],
+    })
+
+
+@pytest.fixture
+def index(movie_df):
+    return TrigramIndex.build(movie_df)
+
+
+def test_normalize_and_trigrams():
+    assert normalize("  Amélie ") == "amelie"
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_edit_distance():
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "abc") == 3
+
+
+def test_similarity_matches_single_word_of_name():
+    assert similarity("tarantino", "quentin tarantino") == 1.0
+    assert similarity("bruce wilis", "bruce willis") > 0.9
+
+
+def test_search_finds_partial_name(index):
+    matches = index.search("tarantino")
+
+    assert matches[0].term == "Quentin Tarantino"
+    assert matches[0].field == "director"
+    assert sorted(matches[0].rows.tolist()) == [0, 1]
+
+
+def test_search_tolerates_typos(index):
+    matches = index.search("bruse wilis")
+
+    assert matches[0].term == "Bruce Willis"
+    assert sorted(matches[0].rows.tolist()) == [0, 2, 4]
+
+
+def test_search_ignores_accents(index):
+    assert index.search("amelie")[0].term == "Amélie"
+
+
+def test_search_restricted_to_fields(index):
+    assert index.search("tarantino", fields=["title"]) == []
+
+
+def test_search_without_match(index):
+    assert index.search("zzzzzz") == []
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / "titles.npz"
+    index.save(path)
+
+    loaded = TrigramIndex.load(path)
+
+    assert loaded.terms == index.terms
+    assert loaded.normalized == index.normalized
+    assert loaded.n_rows == index.n_rows
+    assert [m.term for m in loaded.search("uma thurmn")] == [m.term for m in index.search("uma thurmn")]
+
+
+def test_fuzzy_search_returns_ranked_rows(movie_df, index):
+    result = fuzzy_search(movie_df, "quentin tarentino", index=index)
+
+    assert list(result["title"]) == ["Pulp Fiction", "Kill Bill: Vol. 1"]
+    assert set(result["match"]) == {"Quentin Tarantino"}
+    assert (result["match_score"] > 0.9).all()
+
+
+def test_fuzzy_search_builds_index_when_missing(movie_df):
+    result = fuzzy_search(movie_df, "looper")
+
+    assert list(result["title"]) == ["Looper"]
+
+
+def test_fuzzy_search_rejects_other_frame(movie_df, index):
+    with pytest.raises(ValueError):
+        fuzzy_search(movie_df.head(2), "looper", index=index)
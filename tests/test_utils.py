@@ -0,0 +1,123 @@
+import threading
+import time
+from settings.utils import CircuitBreaker, RetryBudget, SingleFlight, iter_threaded, run_threaded
+
+
+def test_run_threaded_maps_inputs_to_results():
+    assert run_threaded(lambda x: x * 2, [1, 2, 3]) == {1: 2, 2: 4, 3: 6}
+
+
+def test_iter_threaded_yields_every_item():
+    assert sorted(iter_threaded(lambda x: x + 1, [1, 2])) == [(1, 2), (2, 3)]
+
+
+def test_single_flight_runs_sequential_calls_separately():
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.stats == {"calls": 2, "executed": 2, "coalesced": 0}
+
+
+def test_single_flight_shares_exception_with_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(timeout=5)
+
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flight.stats["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_retry_budget_caps_retries_at_ratio_of_requests():
+    budget = RetryBudget(ratio=0.1, reserve=2)
+
+    spent = 0
+    for _ in range(100):
+        budget.deposit()
+        spent += budget.try_spend()
+
+    # The reserve plus a tenth of the requests made after it was spent
+    assert spent == 2 + 9
+    assert budget.stats == {"requests": 100, "retries": 11, "retries_denied": 89}
+
+
+def test_retry_budget_does_not_save_up_past_reserve():
+    budget = RetryBudget(ratio=0.5, reserve=3)
+    for _ in range(1000):
+        budget.deposit()
+
+    assert sum(budget.try_spend() for _ in range(10)) == 3
+
+
+def test_circuit_breaker_opens_on_error_rate_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=4, cooldown=30, clock=clock)
+
+    for success in (True, False, True):
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    # After the cooldown a single probe goes through
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats == {"rejected": 2, "opened": 1}
+
+
+def test_circuit_breaker_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=2, cooldown=30, clock=clock)
+    breaker.record(False)
+    breaker.record(False)
+
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record(False)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 59
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
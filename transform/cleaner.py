@@ -1,6 +1,8 @@
 import pandas as pd
 import ast
-from typing import Optional, List, Self
+from pathlib import Path
+from typing import Optional, List, Self, Union
+from transform.snapshot import write_snapshot
 
 # A class for handing the data cleaning and processing
 class MovieDataCleaner():
@@ -172,10 +174,38 @@ class MovieDataCleaner():
         self.df = self.df[existing_cols]
         return self
     
+    def add_derived_metrics(self) -> Self:
+        """
+        Adds the per-movie metrics the KPI functions rank and group on, computed once:
+        - profit: revenue_musd - budget_musd
+        - roi: revenue_musd / budget_musd, NaN where the budget is missing or zero
+        - is_franchise: whether the movie belongs to a collection
+        The KPI functions reuse these columns when present instead of recomputing them.
+        """
+        if {"budget_musd", "revenue_musd"}.issubset(self.df.columns):
+            budget = pd.to_numeric(self.df["budget_musd"], errors="coerce").astype("float64")
+            revenue = pd.to_numeric(self.df["revenue_musd"], errors="coerce").astype("float64")
+
+            self.df["profit"] = revenue - budget
+            self.df["roi"] = revenue / budget.where(budget > 0)
+
+        if "belongs_to_collection" in self.df.columns:
+            self.df["is_franchise"] = self.df["belongs_to_collection"].notna()
+
+        return self
+    
     def reset_index(self) -> Self:
         self.df = self.df.reset_index(drop=True)
         return self
 
+    def to_snapshot(self, path: Union[str, Path]) -> Self:
+        """
+        Writes the cleaned dataframe as a memory-mappable snapshot,
+        analysis processes then share it with `transform.snapshot.open_snapshot`.
+        """
+        write_snapshot(self.df, path)
+        return self
+
             
     
     
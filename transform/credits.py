@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def extract_credit_info(movie: dict) -> dict:
+    """Extract cast list, cast size, director, and crew size from TMDB credits.
+    Missing or null credits, cast and crew count as empty.
+    """
+    credits = movie.get("credits") or {}
+
+    cast_list = [member.get("name") for member in credits.get("cast") or [] if "name" in member]
+    cast_size = len(cast_list)
+
+    crew_list = credits.get("crew") or []
+    crew_size = len(crew_list)
+
+    director = None
+    for member in crew_list:
+        if member.get("job") == "Director":
+            director = member.get("name")
+            break
+
+    return {
+        "cast": cast_list,
+        "cast_size": cast_size,
+        "director": director,
+        "crew_size": crew_size,
+    }
+
+
+def attach_credits(movies: Dict[int, Optional[dict]]) -> Dict[int, Optional[dict]]:
+    """
+    Adds the credit fields to every payload in place, as the fetch threads used to
+    do one movie at a time, and returns the same mapping. A payload whose credits
+    cannot be read becomes None, like a failed fetch, without affecting the others.
+    """
+    for movie_id, payload in movies.items():
+        if payload is None:
+            continue
+        try:
+            payload.update(extract_credit_info(payload))
+        except Exception as exc:
+            logger.warning("Dropping movie %s, invalid credits: %s: %s", movie_id, type(exc).__name__, exc)
+            movies[movie_id] = None
+    return movies
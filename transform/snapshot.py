@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+META_FILE = "_meta.json"
+# Generation directories sit next to the snapshot path, which is a symlink to the live one
+GENERATION_MARKER = ".gen-"
+
+
+def _codes_dtype(n_categories: int) -> np.dtype:
+    # Same width pandas picks for categorical codes, so it can use the mapped array as is
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _column_kind(series: pd.Series) -> str:
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not series.isna().any():
+        return "bool"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        raise TypeError(f"Column '{series.name}' is timezone aware, convert it to naive datetimes first.")
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return "numeric"
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ("integer", "floating", "mixed-integer-float", "decimal", "boolean"):
+        # e.g. object columns left behind by replace(0, pd.NA)
+        return "numeric"
+    if inferred in ("string", "empty"):
+        return "dictionary"
+    raise TypeError(f"Column '{series.name}' holds {inferred} values, which a snapshot cannot store.")
+
+
+def _numeric_array(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.isna().any():
+        return series.to_numpy(dtype="int64")
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _write_column(directory: Path, position: int, series: pd.Series) -> dict:
+    kind = _column_kind(series)
+    entry = {"name": series.name, "kind": kind}
+
+    if kind == "bool":
+        np.save(directory / f"{position}.npy", series.to_numpy(dtype=bool))
+    elif kind == "datetime":
+        np.save(directory / f"{position}.npy", series.to_numpy(dtype="datetime64[ns]").view("int64"))
+    elif kind == "numeric":
+        np.save(directory / f"{position}.npy", _numeric_array(series))
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        encoded = [value.encode("utf-8") for value in uniques]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+
+        np.save(directory / f"{position}.codes.npy", codes.astype(_codes_dtype(len(uniques))))
+        np.save(directory / f"{position}.dict.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        np.save(directory / f"{position}.offsets.npy", offsets)
+
+    return entry
+
+
+def _remove_old_generations(path: Path, live: Path, retain_seconds: float) -> None:
+    cutoff = time.time() - retain_seconds
+    for generation in path.parent.glob(f"{path.name}{GENERATION_MARKER}*"):
+        if generation.name == live.name:
+            continue
+        try:
+            if generation.stat().st_mtime <= cutoff:
+                shutil.rmtree(generation, ignore_errors=True)
+        except FileNotFoundError:
+            # Removed by a concurrent writer
+            pass
+
+
+def write_snapshot(df: pd.DataFrame, path: Union[str, Path], retain_seconds: float = 60.0) -> Path:
+    """
+    Writes the frame as a directory of raw NumPy column files that any number of
+    processes can map read-only with `open_snapshot`.
+
+    Numeric, boolean and datetime columns are stored as flat arrays (nullable
+    integers become float64 with NaN), text columns as integer codes plus a sorted
+    string dictionary. The index is not stored, reset it first if it matters.
+
+    Every write is a new generation directory `<path>.gen-<uuid>`; `path` is a
+    symlink repointed to it with one `os.replace`, so readers always find a
+    complete snapshot. Generations replaced more than `retain_seconds` ago are
+    deleted, readers still opening one within that window are unaffected. The
+    replacement time is kept as the generation directory's mtime.
+    """
+    path = Path(path)
+    generation = path.with_name(f"{path.name}{GENERATION_MARKER}{uuid.uuid4().hex}")
+    generation.mkdir(parents=True)
+
+    try:
+        columns = [_write_column(generation, i, df[name]) for i, name in enumerate(df.columns)]
+        meta = {"version": SNAPSHOT_VERSION, "n_rows": len(df), "columns": columns}
+        (generation / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+        if path.is_dir() and not path.is_symlink():
+            # A snapshot written before generations existed, replaced once non-atomically
+            shutil.rmtree(path)
+
+        if path.is_symlink() and path.exists():
+            # The outgoing generation's mtime becomes its replacement time, which retention counts from
+            os.utime(path)
+        link = path.with_name(f".{path.name}.{uuid.uuid4().hex}.link")
+        os.symlink(generation.name, link, target_is_directory=True)
+        os.replace(link, path)
+    except BaseException:
+        shutil.rmtree(generation, ignore_errors=True)
+        raise
+
+    # Processes that already mapped files of a removed generation keep reading them until they close
+    _remove_old_generations(path, generation, retain_seconds)
+    return path
+
+
+def _read_dictionary(directory: Path, position: int) -> List[str]:
+    blob = np.load(directory / f"{position}.dict.npy").tobytes()
+    offsets = np.load(directory / f"{position}.offsets.npy").tolist()
+    return [blob[start:stop].decode("utf-8") for start, stop in zip(offsets, offsets[1:])]
+
+
+def open_snapshot(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Opens a snapshot written by `write_snapshot` without deserializing it.
+
+    Column data stays in the memory-mapped files, shared through the page cache
+    by every process that opens the same snapshot; only the string dictionaries
+    are decoded. The returned frame is read-only, text columns come back as
+    categoricals.
+    """
+    # Resolved once, so every file comes from the same generation even if it is replaced meanwhile
+    directory = Path(path).resolve()
+    meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    if meta["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {meta['version']}.")
+
+    # An empty array cannot be memory-mapped
+    mmap_mode = "r" if meta["n_rows"] else None
+
+    columns = {}
+    for position, entry in enumerate(meta["columns"]):
+        kind = entry["kind"]
+        if kind == "dictionary":
+            codes = np.load(directory / f"{position}.codes.npy", mmap_mode=mmap_mode)
+            categories = pd.Index(_read_dictionary(directory, position), dtype=object)
+            columns[entry["name"]] = pd.Categorical.from_codes(
+                codes, dtype=pd.CategoricalDtype(categories), validate=False
+            )
+        else:
+            values = np.load(directory / f"{position}.npy", mmap_mode=mmap_mode)
+            columns[entry["name"]] = values.view("datetime64[ns]") if kind == "datetime" else values
+
+    return pd.DataFrame(columns, index=pd.RangeIndex(meta["n_rows"]), copy=False)